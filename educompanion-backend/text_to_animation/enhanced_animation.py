@@ -4,6 +4,8 @@ Includes advanced slide generation, transitions, visual effects, and scene manag
 """
 
 import os
+import shutil
+import tempfile
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
@@ -359,10 +361,21 @@ class AdvancedVideoGenerator:
         temp_dir = self.config.get('temp_directory', 'ttm_tmp')
         os.makedirs(temp_dir, exist_ok=True)
         
+        # A private directory per video, so concurrent renders never
+        # overwrite each other's slides
+        slide_dir = tempfile.mkdtemp(prefix='slides_', dir=temp_dir)
+        try:
+            return self._render_slides(slide_configs, audio_path, output_path, slide_dir)
+        finally:
+            shutil.rmtree(slide_dir, ignore_errors=True)
+    
+    def _render_slides(self, slide_configs: List[SlideConfig], audio_path: Optional[str],
+                       output_path: str, slide_dir: str) -> str:
+        """Write the slide images into `slide_dir` and encode them with the audio"""
         # Generate slide images
         slide_paths = []
         for i, slide_config in enumerate(slide_configs):
-            slide_path = os.path.join(temp_dir, f'enhanced_slide_{i}.png')
+            slide_path = os.path.join(slide_dir, f'enhanced_slide_{i}.png')
             self.slide_generator.create_slide_with_effects(slide_config, slide_path)
             slide_paths.append(slide_path)
         
@@ -423,7 +436,7 @@ class AdvancedVideoGenerator:
             fps=fps,
             codec=codec,
             audio_codec=audio_codec,
-            temp_audiofile='temp-audio.m4a',
+            temp_audiofile=os.path.join(slide_dir, 'temp-audio.m4a'),
             remove_temp=True
         )
         
@@ -4,13 +4,108 @@ These create concept-specific visualizations based on actual note content
 """
 
 import numpy as np
+import matplotlib
+# Frames are only ever saved to files, so render off-screen whatever the
+# default backend of the host is
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import matplotlib.animation as animation
 from matplotlib.patches import Rectangle, Circle, FancyBboxPatch, Arrow, Ellipse, Polygon
 import matplotlib.patches as mpatches
 import math
-import os
-from typing import List, Dict, Any, Tuple
+import queue
+import subprocess
+import threading
+from typing import List, Dict, Any
+
+# The H.264 encoder choice, shared with the other animators
+try:
+    from .video_encoding import h264_encoder_args
+except ImportError:
+    from video_encoding import h264_encoder_args
+
+
+def _tight_bbox(fig):
+    """The region savefig(bbox_inches='tight') would crop the figure to.
+    
+    'tight' measures the whole figure again on every save; the animators
+    measure their first frame once and crop every frame to it, which also
+    keeps all frames the same size.
+    """
+    return fig.get_tightbbox(fig.canvas.get_renderer()).padded(plt.rcParams['savefig.pad_inches'])
+
+
+class _FrameStream:
+    """Streams raw RGBA frames to ffmpeg without touching the disk.
+    
+    Each frame is cropped straight out of the Agg canvas and queued; a
+    writer thread feeds the pixels to ffmpeg's stdin while the animator
+    draws the next one.
+    """
+    
+    def __init__(self, output_path: str, fps: int):
+        self.output_path = output_path
+        self.fps = fps
+        # ffmpeg needs the frame size up front, so it starts with the first frame
+        self.process = None
+        self.started = False
+        self.frames = queue.Queue(maxsize=32)
+        self.writer = threading.Thread(target=self._drain, daemon=True)
+        self.writer.start()
+    
+    def write_frame(self, fig, bbox):
+        """Queue the figure, cropped to `bbox`, as the next frame"""
+        fig.canvas.draw()
+        canvas = np.asarray(fig.canvas.buffer_rgba())
+        # What savefig(bbox_inches=bbox) would write, snapped to whole pixels,
+        # without the PNG encode here and decode in ffmpeg
+        dpi = fig.dpi
+        width, height = int(bbox.width * dpi), int(bbox.height * dpi)
+        left = max(round(bbox.x0 * dpi), 0)
+        top = max(round(canvas.shape[0] - bbox.y0 * dpi) - height, 0)
+        frame = canvas[top:top + height, left:left + width]
+        if not self.started:
+            self.started = True
+            self._start(frame.shape[1], frame.shape[0])
+        self.frames.put(frame.tobytes())
+    
+    def _start(self, width: int, height: int):
+        try:
+            # Import locally to avoid import conflicts; this is the ffmpeg build MoviePy uses
+            import imageio_ffmpeg
+            
+            # H.264 needs even dimensions, which the cropped frames may not have
+            self.process = subprocess.Popen([
+                imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-loglevel', 'error',
+                '-f', 'rawvideo', '-pixel_format', 'rgba', '-video_size', f'{width}x{height}',
+                '-framerate', str(self.fps), '-i', '-',
+                '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',
+                *h264_encoder_args(), '-pix_fmt', 'yuv420p', self.output_path
+            ], stdin=subprocess.PIPE)
+        except Exception as e:
+            print(f"Error creating video: {e}")
+    
+    def _drain(self):
+        # Keeps taking frames after a failed write so the animator never blocks
+        while (frame := self.frames.get()) is not None:
+            if self.process is None:
+                continue
+            try:
+                self.process.stdin.write(frame)
+            except OSError as e:
+                print(f"Error creating video: {e}")
+                self.process.kill()
+                self.process = None
+    
+    def close(self):
+        """Wait for the queued frames and for ffmpeg to finish the video"""
+        self.frames.put(None)
+        self.writer.join()
+        if self.process is None:
+            return
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            print(f"Error creating video: ffmpeg exited with code {self.process.returncode}")
 
 
 class EnhancedPhysicsAnimator:
@@ -51,7 +146,6 @@ class EnhancedPhysicsAnimator:
         if time_max == 0:
             time_max = 5
         
-        frame_count = 0
         total_frames = int(time_max * self.fps)
         
         def draw_motion_frame(t):
@@ -124,15 +218,18 @@ class EnhancedPhysicsAnimator:
                     fontweight='bold')
         
         # Generate frames
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for frame in range(total_frames):
             t = frame / self.fps
             draw_motion_frame(t)
             plt.tight_layout()
-            plt.savefig(f'temp_frame_{frame:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_forces(self, values: Dict, output_path: str, concept: Dict) -> str:
@@ -143,7 +240,6 @@ class EnhancedPhysicsAnimator:
         force = values.get('force', 50)  # N
         acceleration = force / mass if mass > 0 else 0
         
-        frame_count = 0
         
         def draw_force_frame(step):
             ax.clear()
@@ -192,13 +288,16 @@ class EnhancedPhysicsAnimator:
                    bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow"))
         
         # Generate frames
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for step in range(120):  # 4 seconds
             draw_force_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_energy(self, values: Dict, output_path: str, concept: Dict) -> str:
@@ -209,7 +308,6 @@ class EnhancedPhysicsAnimator:
         height = values.get('distance', 10)  # m (using distance as height)
         g = 9.8
         
-        frame_count = 0
         
         def draw_energy_frame(step):
             ax.clear()
@@ -280,13 +378,16 @@ class EnhancedPhysicsAnimator:
         fall_time = math.sqrt(2 * height / g)
         total_frames = int(fall_time * self.fps) + 60  # Extra frames at end
         
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for step in range(total_frames):
             draw_energy_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_waves(self, values: Dict, output_path: str, concept: Dict) -> str:
@@ -297,7 +398,6 @@ class EnhancedPhysicsAnimator:
         wavelength = values.get('wavelength', 3)  # m
         amplitude = 2  # m
         
-        frame_count = 0
         
         def draw_wave_frame(t):
             ax.clear()
@@ -348,14 +448,17 @@ class EnhancedPhysicsAnimator:
         period = 1 / frequency
         total_frames = int(2 * period * self.fps)  # 2 periods
         
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for frame in range(total_frames):
             t = frame / self.fps
             draw_wave_frame(t)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_electricity(self, values: Dict, output_path: str, concept: Dict) -> str:
@@ -367,7 +470,6 @@ class EnhancedPhysicsAnimator:
         current = voltage / resistance if resistance > 0 else 0  # A
         power = voltage * current  # W
         
-        frame_count = 0
         
         def draw_circuit_frame(step):
             ax.clear()
@@ -433,34 +535,21 @@ class EnhancedPhysicsAnimator:
                    verticalalignment='top')
         
         # Generate frames
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for step in range(150):  # 5 seconds
             draw_circuit_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
-    
-    def _frames_to_video(self, frame_count: int, output_path: str):
-        """Convert frames to video"""
-        try:
-            from moviepy.editor import ImageSequenceClip
-            
-            frame_files = [f'temp_frame_{i:04d}.png' for i in range(frame_count)]
-            existing_frames = [f for f in frame_files if os.path.exists(f)]
-            
-            if existing_frames:
-                clip = ImageSequenceClip(existing_frames, fps=self.fps)
-                clip.write_videofile(output_path, codec='libx264', logger=None)
-                clip.close()
-                
-                # Clean up frames
-                for frame_file in existing_frames:
-                    if os.path.exists(frame_file):
-                        os.remove(frame_file)
-        except Exception as e:
-            print(f"Error creating video: {e}")
+
+
+# Indices of the particles shown during a reaction
+_PARTICLES = np.arange(5)
 
 
 class EnhancedChemistryAnimator:
@@ -499,7 +588,6 @@ class EnhancedChemistryAnimator:
         else:
             reaction = "2H₂ + O₂ → 2H₂O"
         
-        frame_count = 0
         
         def draw_reaction_frame(step):
             ax.clear()
@@ -529,11 +617,10 @@ class EnhancedChemistryAnimator:
                        fontweight='bold', color='red')
                 ax.text(6, 4.5, '⚡ ENERGY ⚡', ha='center', fontsize=16, color='red')
                 
-                # Animation particles
-                for i in range(5):
-                    x = 4 + i * 0.8 + np.sin(step * 0.3 + i) * 0.3
-                    y = 4 + np.cos(step * 0.2 + i) * 0.3
-                    ax.plot(x, y, 'ro', markersize=8, alpha=0.7)
+                # Animation particles, as one line of markers
+                x = 4 + _PARTICLES * 0.8 + np.sin(step * 0.3 + _PARTICLES) * 0.3
+                y = 4 + np.cos(step * 0.2 + _PARTICLES) * 0.3
+                ax.plot(x, y, 'ro', markersize=8, alpha=0.7)
             else:  # Products phase
                 ax.text(6, 6, 'PRODUCTS', ha='center', fontsize=18, fontweight='bold', color='green')
                 ax.text(6, 4.5, products.strip(), ha='center', fontsize=16,
@@ -558,13 +645,16 @@ class EnhancedChemistryAnimator:
                    verticalalignment='top')
         
         # Generate frames
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for step in range(180):  # 6 seconds
             draw_reaction_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_molecular_structure(self, formulas: List[str], output_path: str, concept: Dict) -> str:
@@ -574,7 +664,6 @@ class EnhancedChemistryAnimator:
         # Use actual formula from notes
         formula = formulas[0] if formulas else "H₂O"
         
-        frame_count = 0
         
         def draw_molecule_frame(step):
             ax.clear()
@@ -653,34 +742,17 @@ class EnhancedChemistryAnimator:
             ax.text(5, 2, f'Rotation: {rotation % 360}°', ha='center', fontsize=10, color='gray')
         
         # Generate frames
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for step in range(120):  # 4 seconds
             draw_molecule_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
-    
-    def _frames_to_video(self, frame_count: int, output_path: str):
-        """Convert frames to video"""
-        try:
-            from moviepy.editor import ImageSequenceClip
-            
-            frame_files = [f'temp_frame_{i:04d}.png' for i in range(frame_count)]
-            existing_frames = [f for f in frame_files if os.path.exists(f)]
-            
-            if existing_frames:
-                clip = ImageSequenceClip(existing_frames, fps=self.fps)
-                clip.write_videofile(output_path, codec='libx264', logger=None)
-                clip.close()
-                
-                # Clean up frames
-                for frame_file in existing_frames:
-                    if os.path.exists(frame_file):
-                        os.remove(frame_file)
-        except Exception as e:
-            print(f"Error creating video: {e}")
 
 
 class EnhancedMathematicsAnimator:
@@ -714,7 +786,6 @@ class EnhancedMathematicsAnimator:
         else:
             func_expr = "x²"
         
-        frame_count = 0
         
         def draw_function_frame(step):
             ax.clear()
@@ -790,34 +861,17 @@ class EnhancedMathematicsAnimator:
             ax.set_ylabel('f(x)', fontsize=12)
         
         # Generate frames
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for step in range(150):  # 5 seconds
             draw_function_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
-    
-    def _frames_to_video(self, frame_count: int, output_path: str):
-        """Convert frames to video"""
-        try:
-            from moviepy.editor import ImageSequenceClip
-            
-            frame_files = [f'temp_frame_{i:04d}.png' for i in range(frame_count)]
-            existing_frames = [f for f in frame_files if os.path.exists(f)]
-            
-            if existing_frames:
-                clip = ImageSequenceClip(existing_frames, fps=self.fps)
-                clip.write_videofile(output_path, codec='libx264', logger=None)
-                clip.close()
-                
-                # Clean up frames
-                for frame_file in existing_frames:
-                    if os.path.exists(frame_file):
-                        os.remove(frame_file)
-        except Exception as e:
-            print(f"Error creating video: {e}")
 
 
 class EnhancedBiologyAnimator:
@@ -845,7 +899,6 @@ class EnhancedBiologyAnimator:
         """Animate cell structure based on terms from notes"""
         fig, ax = plt.subplots(figsize=(12, 8))
         
-        frame_count = 0
         
         def draw_cell_frame(step):
             ax.clear()
@@ -915,31 +968,14 @@ class EnhancedBiologyAnimator:
                        bbox=dict(boxstyle="round,pad=0.3", facecolor='yellow'), fontweight='bold')
         
         # Generate frames
+        video = _FrameStream(output_path, self.fps)
+        bbox = None
         for step in range(180):  # 6 seconds
             draw_cell_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            if bbox is None:
+                bbox = _tight_bbox(fig)
+            video.write_frame(fig, bbox)
         
         plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
-    
-    def _frames_to_video(self, frame_count: int, output_path: str):
-        """Convert frames to video"""
-        try:
-            from moviepy.editor import ImageSequenceClip
-            
-            frame_files = [f'temp_frame_{i:04d}.png' for i in range(frame_count)]
-            existing_frames = [f for f in frame_files if os.path.exists(f)]
-            
-            if existing_frames:
-                clip = ImageSequenceClip(existing_frames, fps=self.fps)
-                clip.write_videofile(output_path, codec='libx264', logger=None)
-                clip.close()
-                
-                # Clean up frames
-                for frame_file in existing_frames:
-                    if os.path.exists(frame_file):
-                        os.remove(frame_file)
-        except Exception as e:
-            print(f"Error creating video: {e}")
\ No newline at end of file
@@ -7,18 +7,238 @@ Supports: Algorithms, Data Structures, Math Concepts, Science, Business Processe
 import os
 import re
 import numpy as np
-import matplotlib.pyplot as plt
 import matplotlib.animation as animation
+from matplotlib.figure import Figure, SubplotParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.patches import Rectangle, Circle, FancyBboxPatch, Arrow
+from matplotlib.collections import LineCollection, PatchCollection
 import cv2
 from PIL import Image, ImageDraw, ImageFont
 from typing import List, Dict, Tuple, Any, Optional
 import json
 import math
+import subprocess
+import shutil
+import tempfile
+import copy
+import hashlib
+import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+
+# Multi-pattern keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Enhanced concept analyzers, only importable when loaded as part of the
+# package. They hold nothing but static pattern tables, so one shared
+# instance of each serves every call.
+try:
+    from .enhanced_concept_analyzers import (
+        EnhancedMathematicsAnalyzer, EnhancedPhysicsAnalyzer,
+        EnhancedChemistryAnalyzer, EnhancedBiologyAnalyzer
+    )
+    ENHANCED_ANALYZERS_AVAILABLE = True
+except ImportError:
+    ENHANCED_ANALYZERS_AVAILABLE = False
+
+# The H.264 encoder choice, shared with the concept animators
+try:
+    from .video_encoding import h264_encoder_args
+except ImportError:
+    from video_encoding import h264_encoder_args
+
+if ENHANCED_ANALYZERS_AVAILABLE:
+    _MATH_ANALYZER = EnhancedMathematicsAnalyzer()
+    _PHYSICS_ANALYZER = EnhancedPhysicsAnalyzer()
+    _CHEMISTRY_ANALYZER = EnhancedChemistryAnalyzer()
+    _BIOLOGY_ANALYZER = EnhancedBiologyAnalyzer()
+else:
+    _MATH_ANALYZER = _PHYSICS_ANALYZER = _CHEMISTRY_ANALYZER = _BIOLOGY_ANALYZER = None
+
+# Operation extraction patterns, compiled once at import time
+# Stack and queue operations are each matched by one alternation scanned with
+# finditer, so operations come out in document order from a single pass.
+# Value-bearing alternatives carry their own named group (push_*/enqueue_*);
+# value-less ones share a single 'pop'/'dequeue' group.
+_STACK_OP_PAT = re.compile(
+    r'stack\.append\s*\(\s*["\']?(?P<push_append>[A-Za-z0-9]+)["\']?\s*\)'  # stack.append(value)
+    r'|\.push\s*\(\s*["\']?(?P<push_method>[A-Za-z0-9]+)["\']?\s*\)'  # obj.push(value)
+    r'|push\s*\(\s*["\']?(?P<push_call>[A-Za-z0-9]+)["\']?\s*\)'  # push(value) or push("value")
+    r'|add\s+(?P<push_add>[A-Za-z0-9]+)\s+to\s+stack'  # "add 10 to stack"
+    r'|insert\s+(?P<push_insert>[A-Za-z0-9]+)\s+into\s+stack'  # "insert 10 into stack"
+    r'|(?P<pop>stack\.pop\s*\(\s*\)'  # stack.pop()
+    r'|\.pop\s*\(\s*\)'  # obj.pop()
+    r'|pop\s*\(\s*\)'  # pop()
+    r'|remove\s+from\s+stack'  # "remove from stack"
+    r'|pop\s+element)'  # "pop element"
+    r'|push\s+(?P<push_word>[A-Za-z0-9]+)',  # "push 10"
+    re.IGNORECASE)
+_QUEUE_OP_PAT = re.compile(
+    r'queue\.append\s*\(\s*["\']?(?P<enqueue_append>[A-Za-z0-9]+)["\']?\s*\)'  # queue.append(value)
+    r'|\.enqueue\s*\(\s*["\']?(?P<enqueue_method>[A-Za-z0-9]+)["\']?\s*\)'  # obj.enqueue(value)
+    r'|enqueue\s*\(\s*["\']?(?P<enqueue_call>[A-Za-z0-9]+)["\']?\s*\)'  # enqueue(value)
+    r'|add\s+(?P<enqueue_add>[A-Za-z0-9]+)\s+to\s+queue'  # "add 10 to queue"
+    r'|insert\s+(?P<enqueue_insert>[A-Za-z0-9]+)\s+into\s+queue'  # "insert 10 into queue"
+    r'|(?P<dequeue>queue\.popleft\s*\(\s*\)'  # queue.popleft()
+    r'|\.dequeue\s*\(\s*\)'  # obj.dequeue()
+    r'|dequeue\s*\(\s*\)'  # dequeue()
+    r'|remove\s+from\s+queue'  # "remove from queue"
+    r'|dequeue\s+element)'  # "dequeue element"
+    r'|enqueue\s+(?P<enqueue_word>[A-Za-z0-9]+)',  # "enqueue 10"
+    re.IGNORECASE)
+# Each tree pattern is paired with a literal it cannot match without, so the
+# regex only runs when a cheap substring check on the lowered text passes.
+# Tree and array patterns only capture digits, so they run case-sensitively
+# on the already-lowered text instead of paying for re.IGNORECASE.
+_TREE_INSERT_PATS = tuple((literal, re.compile(p)) for literal, p in (
+    ('insert', r'insert\s*\(\s*(\d+)\s*\)'),  # insert(25)
+    ('createnode', r'createnode\s*\(\s*(\d+)\s*\)'),  # createNode(25), common in C code
+    ('newnode', r'newnode.*?=.*?(\d+)'),  # newNode assignments
+    ('data', r'data\s*=\s*(\d+)'),  # data assignments to nodes
+    ('insert', r'insert\s*\([^,]*,\s*(\d+)\s*\)'),  # insert(root, 25)
+))
+_LIST_INSERT_PAT = re.compile(r'insert\s*\(?\s*(\w+)\s*\)?', re.IGNORECASE)
+_LIST_APPEND_PAT = re.compile(r'append\s*\(?\s*(\w+)\s*\)?', re.IGNORECASE)
+_LIST_DELETE_PAT = re.compile(r'delete\s*\(\s*\)', re.IGNORECASE)
+_GRAPH_NODE_PAT = re.compile(r'add.*node\s*\(?\s*(\w+)\s*\)?', re.IGNORECASE)
+_GRAPH_EDGE_PAT = re.compile(r'add.*edge\s*\(?\s*(\w+)\s*,\s*(\w+)\s*\)?', re.IGNORECASE)
+_HASH_INSERT_PAT = _LIST_INSERT_PAT
+_HASH_SEARCH_PAT = re.compile(r'search\s*\(?\s*(\w+)\s*\)?', re.IGNORECASE)
+_HASH_DELETE_PAT = re.compile(r'delete\s*\(?\s*(\w+)\s*\)?', re.IGNORECASE)
+_ARRAY_INSERT_PAT = re.compile(r'insert\s*\(\s*(\d+)\s*,?\s*(\d+)?\s*\)')
+_ARRAY_APPEND_PAT = re.compile(r'append\s*\(\s*(\d+)\s*\)')
+_ARRAY_DELETE_PAT = re.compile(r'delete\s*\(\s*(\d+)?\s*\)')
+_NUMBERED_OP_PAT = re.compile(r'(?:^\d+\.|\-|\*)\s*(.+)', re.MULTILINE | re.IGNORECASE)
+_NUMBERED_PUSH_PAT = re.compile(r'(?:push|add|insert).*?(\d+|[A-Za-z]+)', re.IGNORECASE)
+_NUMBERED_POP_PAT = re.compile(r'(?:pop|remove|delete)')
+_NUMBERED_ENQUEUE_PAT = re.compile(r'(?:enqueue|add|insert|put).*?(\d+|[A-Za-z]+)', re.IGNORECASE)
+_NUMBERED_DEQUEUE_PAT = re.compile(r'(?:dequeue|remove|take)')
+_VALUE_TOKEN_PAT = re.compile(r'\b(\d+|[A-Z])\b')
+_ARRAY_LITERAL_PAT = re.compile(r'\[([^\]]+)\]')
+_CSV_SPLIT_PAT = re.compile(r'\s*,\s*')
+# Sentence boundaries for text slides: terminal punctuation followed by
+# whitespace or the end of the text, so decimals like 3.14 stay intact
+_SENTENCE_SPLIT_PAT = re.compile(r'[.!?]+(?:\s+|$)')
+
+# Every substring the data structure extractor branches on; which of them occur
+# is worked out once per text, so each branch is a set lookup, not a rescan
+_DS_TRIGGER_WORDS = (
+    'stack', 'queue', 'tree', 'binary tree', 'bst', 'binary search tree', 'node',
+    'struct node', 'linked list', 'linkedlist', 'list', 'graph', 'dfs', 'depth.*first',
+    'bfs', 'breadth.*first', 'hash', 'hash table', 'hashtable', 'array', 'push', 'pop',
+    'lifo', 'enqueue', 'dequeue', 'fifo', 'data structure', 'insert', 'delete',
+    'createnode', 'newnode', 'data', '50', '30', '70', '20', '40', '60', '80',
+)
+
+# Sample operations used when the notes name a structure but no concrete
+# operations could be parsed; copied out per call so callers can't mutate them
+_SAMPLE_OPERATIONS = {
+    'stack': (
+        {'type': 'stack_push', 'value': '10'},
+        {'type': 'stack_push', 'value': '20'},
+        {'type': 'stack_pop'},
+        {'type': 'stack_push', 'value': '30'},
+    ),
+    'queue': (
+        {'type': 'queue_enqueue', 'value': 'A'},
+        {'type': 'queue_enqueue', 'value': 'B'},
+        {'type': 'queue_dequeue'},
+        {'type': 'queue_enqueue', 'value': 'C'},
+    ),
+    'bst': (
+        {'type': 'tree_insert', 'value': '50'},
+        {'type': 'tree_insert', 'value': '30'},
+        {'type': 'tree_insert', 'value': '70'},
+        {'type': 'tree_insert', 'value': '20'},
+        {'type': 'tree_insert', 'value': '40'},
+        {'type': 'tree_insert', 'value': '60'},
+        {'type': 'tree_insert', 'value': '80'},
+    ),
+    'tree': (
+        {'type': 'tree_insert', 'value': '10'},
+        {'type': 'tree_insert', 'value': '5'},
+        {'type': 'tree_insert', 'value': '15'},
+        {'type': 'tree_insert', 'value': '3'},
+        {'type': 'tree_insert', 'value': '7'},
+        {'type': 'tree_insert', 'value': '12'},
+        {'type': 'tree_insert', 'value': '18'},
+    ),
+    'list': (
+        {'type': 'list_insert', 'value': '10'},
+        {'type': 'list_append', 'value': '20'},
+        {'type': 'list_insert', 'value': '5'},
+        {'type': 'list_delete'},
+    ),
+    'graph': (
+        {'type': 'graph_add_node', 'node': 'A'},
+        {'type': 'graph_add_node', 'node': 'B'},
+        {'type': 'graph_add_node', 'node': 'C'},
+        {'type': 'graph_add_edge', 'from_node': 'A', 'to_node': 'B'},
+        {'type': 'graph_add_edge', 'from_node': 'B', 'to_node': 'C'},
+        {'type': 'graph_dfs', 'node': 'A'},
+    ),
+    'hash': (
+        {'type': 'hash_insert', 'key': 'John'},
+        {'type': 'hash_insert', 'key': 'Jane'},
+        {'type': 'hash_search', 'key': 'John'},
+        {'type': 'hash_insert', 'key': 'Bob'},
+        {'type': 'hash_delete', 'key': 'Jane'},
+    ),
+    'array': (
+        {'type': 'array_append', 'value': '10'},
+        {'type': 'array_append', 'value': '20'},
+        {'type': 'array_insert', 'value': '15', 'index': '1'},
+        {'type': 'array_delete', 'index': '0'},
+    ),
+}
+
+
+# Keyword hits score 2, except for terms specific enough to one content type
+# to score 5 there
+_KEYWORD_WEIGHTS = {
+    ('physics', 'kinematics'): 5,
+    ('physics', 'dynamics'): 5,
+    ('physics', 'momentum'): 5,
+    ('physics', 'velocity'): 5,
+    ('physics', 'acceleration'): 5,
+    ('chemistry', 'reaction'): 5,
+    ('chemistry', 'molecule'): 5,
+    ('chemistry', 'chemical'): 5,
+    ('chemistry', 'formula'): 5,
+    ('biology', 'cell'): 5,
+    ('biology', 'dna'): 5,
+    ('biology', 'organism'): 5,
+    ('biology', 'gene'): 5,
+    ('mathematics', 'equation'): 5,
+    ('mathematics', 'function'): 5,
+    ('mathematics', 'derivative'): 5,
+    ('mathematics', 'integral'): 5,
+}
+
+
+def _sample_operations(kind: str) -> List[Dict]:
+    """Fresh copy of the sample operations for a structure kind"""
+    return [dict(op) for op in _SAMPLE_OPERATIONS[kind]]
 
 class ContentAnalyzer:
     """Analyzes content and determines appropriate animation type"""
     
+    # Keyword index (term table + automaton + trigger automaton) built from the
+    # static patterns once per process and shared by every instance
+    _keyword_index = None
+    
+    # Recent analyses keyed on a digest of the input text, so re-submitted
+    # notes skip scoring and extraction without the cache holding the text
+    _analysis_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+    _analysis_cache_size = 128
+    _analysis_cache_lock = threading.Lock()
+    
     def __init__(self):
         self.content_patterns = {
             'data_structures': {
@@ -53,89 +273,134 @@ class ContentAnalyzer:
                 'concepts': ['decision', 'approval', 'review', 'implementation']
             }
         }
+        
+        # Flatten every pattern into term -> ((category_index, weight), ...) once,
+        # so scoring is a single pass over the text instead of one scan per term,
+        # accumulating into a plain list indexed by category
+        if ContentAnalyzer._keyword_index is None:
+            categories = tuple(self.content_patterns)
+            term_weights = self._build_term_weights(categories)
+            if AHOCORASICK_AVAILABLE:
+                automaton = self._build_automaton(term_weights)
+                trigger_automaton = self._build_automaton({word: word for word in _DS_TRIGGER_WORDS})
+            else:
+                automaton = trigger_automaton = None
+            ContentAnalyzer._keyword_index = (categories, term_weights, automaton, trigger_automaton)
+        (self._categories, self._term_weights,
+         self._automaton, self._trigger_automaton) = ContentAnalyzer._keyword_index
     
-    def analyze_content(self, text: str) -> Dict[str, Any]:
-        """Analyze text content and determine animation type"""
-        text_lower = text.lower()
-        content_scores = {}
+    def _build_term_weights(self, categories: Tuple[str, ...]) -> Dict[str, Tuple[Tuple[int, int], ...]]:
+        """Map each lowercased term to the (category index, weight) pairs it scores"""
+        category_index = {content_type: i for i, content_type in enumerate(categories)}
+        weights: Dict[str, Dict[int, int]] = {}
+        
+        def add(term: str, content_type: str, weight: int):
+            per_type = weights.setdefault(term.lower(), {})
+            index = category_index[content_type]
+            per_type[index] = per_type.get(index, 0) + weight
         
-        # Score each content type with better specificity
         for content_type, patterns in self.content_patterns.items():
-            score = 0
-            
-            # Check keywords with different weights based on specificity
             for keyword in patterns.get('keywords', []):
-                count = text_lower.count(keyword.lower())
-                if content_type == 'physics':
-                    # Physics gets higher weight for specific physics terms
-                    if keyword in ['kinematics', 'dynamics', 'momentum', 'velocity', 'acceleration']:
-                        score += count * 5
-                    else:
-                        score += count * 2
-                elif content_type == 'chemistry':
-                    # Chemistry gets higher weight for specific chemistry terms
-                    if keyword in ['reaction', 'molecule', 'chemical', 'formula']:
-                        score += count * 5
-                    else:
-                        score += count * 2
-                elif content_type == 'biology':
-                    # Biology gets higher weight for specific biology terms
-                    if keyword in ['cell', 'dna', 'organism', 'gene']:
-                        score += count * 5
-                    else:
-                        score += count * 2
-                elif content_type == 'mathematics':
-                    # Mathematics gets higher weight for specific math terms
-                    if keyword in ['equation', 'function', 'derivative', 'integral']:
-                        score += count * 5
-                    else:
-                        score += count * 2
-                else:
-                    score += count * 2
-            
-            # Check operations/patterns
+                add(keyword, content_type, _KEYWORD_WEIGHTS.get((content_type, keyword), 2))
             for pattern in patterns.get('operations', []) + patterns.get('patterns', []):
-                score += text_lower.count(pattern.lower()) * 3
-            
-            # Check symbols for math/science
+                add(pattern, content_type, 3)
             for symbol in patterns.get('symbols', []):
-                score += text.count(symbol) * 1
-            
-            # Check concepts
+                add(symbol, content_type, 1)
             for concept in patterns.get('concepts', []):
-                score += text_lower.count(concept.lower()) * 2
-            
-            content_scores[content_type] = score
+                add(concept, content_type, 2)
+        
+        return {term: tuple(per_type.items()) for term, per_type in weights.items()}
+    
+    def _build_automaton(self, payloads: Dict[str, Any]):
+        """Compile terms into one Aho-Corasick automaton reporting each term's payload"""
+        automaton = ahocorasick.Automaton()
+        for term, payload in payloads.items():
+            automaton.add_word(term, payload)
+        automaton.make_automaton()
+        return automaton
+    
+    def analyze_content(self, text: str) -> Dict[str, Any]:
+        """Analyze text content and determine animation type"""
+        key = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        
+        with self._analysis_cache_lock:
+            cached = self._analysis_cache.get(key)
+            if cached is not None:
+                self._analysis_cache.move_to_end(key)
+        if cached is not None:
+            # Hand out a copy so callers can't mutate the cached result
+            return copy.deepcopy(cached)
+        
+        analysis = self._analyze_content(text)
+        
+        with self._analysis_cache_lock:
+            self._analysis_cache[key] = copy.deepcopy(analysis)
+            if len(self._analysis_cache) > self._analysis_cache_size:
+                self._analysis_cache.popitem(last=False)
+        return analysis
+    
+    def _analyze_content(self, text: str) -> Dict[str, Any]:
+        """Score the text against every content type and extract its elements"""
+        text_lower = text.lower()
+        
+        # Blank input (e.g. an OCR pass that found no text) has nothing to score
+        # or extract, so skip the scan and the extractors entirely
+        if not text_lower.strip():
+            return {
+                'type': 'general',
+                'score': 0,
+                'elements': [],
+                'all_scores': dict.fromkeys(self._categories, 0)
+            }
         
-        # Determine primary content type
-        primary_type = max(content_scores, key=content_scores.get) if any(content_scores.values()) else 'general'
+        # Score all content types in one pass over the text
+        scores = [0] * len(self._categories)
+        if self._automaton is not None:
+            for _, matches in self._automaton.iter(text_lower):
+                for index, weight in matches:
+                    scores[index] += weight
+        else:
+            for term, matches in self._term_weights.items():
+                count = text_lower.count(term)
+                if count:
+                    for index, weight in matches:
+                        scores[index] += count * weight
+        content_scores = dict(zip(self._categories, scores))
+        
+        # Determine primary content type (first highest score wins, 'general' if none)
+        primary_type, best_score = 'general', 0
+        for content_type, score in content_scores.items():
+            if score > best_score:
+                primary_type, best_score = content_type, score
         
         # Extract specific elements based on content type
-        elements = self._extract_elements(text, primary_type)
+        elements = self._extract_elements(text, primary_type, text_lower)
         
         return {
             'type': primary_type,
-            'score': content_scores[primary_type],
+            'score': best_score,
             'elements': elements,
             'all_scores': content_scores
         }
     
-    def _extract_elements(self, text: str, content_type: str) -> List[Dict]:
+    def _extract_elements(self, text: str, content_type: str, text_lower: Optional[str] = None) -> List[Dict]:
         """Extract specific elements for animation based on content type"""
         elements = []
+        if text_lower is None:
+            text_lower = text.lower()
         
         if content_type == 'data_structures':
-            elements = self._extract_data_structure_operations(text)
+            elements = self._extract_data_structure_operations(text, text_lower)
         elif content_type == 'algorithms':
-            elements = self._extract_algorithm_steps(text)
+            elements = self._extract_algorithm_steps(text, text_lower)
         elif content_type == 'mathematics':
-            elements = self._extract_math_concepts(text)
+            elements = self._extract_math_concepts(text, text_lower)
         elif content_type == 'physics':
-            elements = self._extract_physics_concepts(text)
+            elements = self._extract_physics_concepts(text, text_lower)
         elif content_type == 'chemistry':
-            elements = self._extract_chemistry_concepts(text)
+            elements = self._extract_chemistry_concepts(text, text_lower)
         elif content_type == 'biology':
-            elements = self._extract_biology_concepts(text)
+            elements = self._extract_biology_concepts(text, text_lower)
         elif content_type == 'business':
             elements = self._extract_process_steps(text)
         else:
@@ -143,260 +408,145 @@ class ContentAnalyzer:
         
         return elements
     
-    def _extract_data_structure_operations(self, text: str) -> List[Dict]:
+    def _present_triggers(self, text_lower: str) -> set:
+        """Subset of _DS_TRIGGER_WORDS occurring in the lowered text"""
+        if self._trigger_automaton is not None:
+            return {word for _, word in self._trigger_automaton.iter(text_lower)}
+        return {word for word in _DS_TRIGGER_WORDS if word in text_lower}
+    
+    def _extract_data_structure_operations(self, text: str, text_lower: Optional[str] = None) -> List[Dict]:
         """Extract data structure operations from text with enhanced pattern matching"""
         operations = []
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        present = self._present_triggers(text_lower)
         
         # Stack operations with enhanced pattern matching
-        if 'stack' in text_lower:
-            # Enhanced patterns for push operations - only capture alphanumeric values
-            push_patterns = [
-                r'push\s*\(\s*["\']?([A-Za-z0-9]+)["\']?\s*\)',  # push(value) or push("value")
-                r'\.push\s*\(\s*["\']?([A-Za-z0-9]+)["\']?\s*\)',  # obj.push(value)
-                r'stack\.append\s*\(\s*["\']?([A-Za-z0-9]+)["\']?\s*\)',  # stack.append(value)
-                r'add\s+([A-Za-z0-9]+)\s+to\s+stack',  # "add 10 to stack"
-                r'push\s+([A-Za-z0-9]+)',  # "push 10"
-                r'insert\s+([A-Za-z0-9]+)\s+into\s+stack',  # "insert 10 into stack"
-            ]
-            
-            for pattern in push_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for value in matches:
-                    clean_value = value.strip().strip('"\'()[]{}')
-                    if clean_value:
-                        operations.append({'type': 'stack_push', 'value': clean_value})
-            
-            # Enhanced patterns for pop operations
-            pop_patterns = [
-                r'pop\s*\(\s*\)',  # pop()
-                r'\.pop\s*\(\s*\)',  # obj.pop()
-                r'stack\.pop\s*\(\s*\)',  # stack.pop()
-                r'remove\s+from\s+stack',  # "remove from stack"
-                r'pop\s+element',  # "pop element"
-            ]
-            
-            for pattern in pop_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for _ in matches:
+        if 'stack' in present:
+            for match in _STACK_OP_PAT.finditer(text):
+                if match.lastgroup == 'pop':
                     operations.append({'type': 'stack_pop'})
+                else:
+                    operations.append({'type': 'stack_push', 'value': match.group(match.lastgroup)})
         
         # Queue operations with enhanced pattern matching
-        elif 'queue' in text_lower:
-            # Enhanced patterns for enqueue operations - only capture alphanumeric values
-            enqueue_patterns = [
-                r'enqueue\s*\(\s*["\']?([A-Za-z0-9]+)["\']?\s*\)',  # enqueue(value)
-                r'\.enqueue\s*\(\s*["\']?([A-Za-z0-9]+)["\']?\s*\)',  # obj.enqueue(value)
-                r'queue\.append\s*\(\s*["\']?([A-Za-z0-9]+)["\']?\s*\)',  # queue.append(value)
-                r'add\s+([A-Za-z0-9]+)\s+to\s+queue',  # "add 10 to queue"
-                r'enqueue\s+([A-Za-z0-9]+)',  # "enqueue 10"
-                r'insert\s+([A-Za-z0-9]+)\s+into\s+queue',  # "insert 10 into queue"
-            ]
-            
-            for pattern in enqueue_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for value in matches:
-                    clean_value = value.strip().strip('"\'()[]{}')
-                    if clean_value:
-                        operations.append({'type': 'queue_enqueue', 'value': clean_value})
-            
-            # Enhanced patterns for dequeue operations
-            dequeue_patterns = [
-                r'dequeue\s*\(\s*\)',  # dequeue()
-                r'\.dequeue\s*\(\s*\)',  # obj.dequeue()
-                r'queue\.popleft\s*\(\s*\)',  # queue.popleft()
-                r'remove\s+from\s+queue',  # "remove from queue"
-                r'dequeue\s+element',  # "dequeue element"
-            ]
-            
-            for pattern in dequeue_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for _ in matches:
+        elif 'queue' in present:
+            for match in _QUEUE_OP_PAT.finditer(text):
+                if match.lastgroup == 'dequeue':
                     operations.append({'type': 'queue_dequeue'})
+                else:
+                    operations.append({'type': 'queue_enqueue', 'value': match.group(match.lastgroup)})
         
         # Binary Tree operations
-        elif any(word in text_lower for word in ['tree', 'binary tree', 'bst', 'binary search tree', 'node', 'struct node']):
-            # Look for insert operations with various patterns
-            insert_matches = re.findall(r'insert\s*\(\s*(\d+)\s*\)', text, re.IGNORECASE)
-            for value in insert_matches:
-                operations.append({'type': 'tree_insert', 'value': value})
-            
-            # Look for createNode operations (common in C code)
-            create_matches = re.findall(r'createNode\s*\(\s*(\d+)\s*\)', text, re.IGNORECASE)
-            for value in create_matches:
-                operations.append({'type': 'tree_insert', 'value': value})
-            
-            # Look for newNode assignments (common pattern)
-            new_node_matches = re.findall(r'newNode.*?=.*?(\d+)', text, re.IGNORECASE)
-            for value in new_node_matches:
-                operations.append({'type': 'tree_insert', 'value': value})
-            
-            # Look for data assignments to nodes
-            data_matches = re.findall(r'data\s*=\s*(\d+)', text, re.IGNORECASE)
-            for value in data_matches:
-                operations.append({'type': 'tree_insert', 'value': value})
-            
-            # Look for function calls with values (e.g., insert(root, 25))
-            func_call_matches = re.findall(r'insert\s*\([^,]*,\s*(\d+)\s*\)', text, re.IGNORECASE)
-            for value in func_call_matches:
-                operations.append({'type': 'tree_insert', 'value': value})
+        elif any(word in present for word in ['tree', 'binary tree', 'bst', 'binary search tree', 'node', 'struct node']):
+            # Look for insert/createNode/newNode/data assignments and insert(root, value) calls
+            for literal, pattern in _TREE_INSERT_PATS:
+                if literal not in present:
+                    continue
+                operations.extend({'type': 'tree_insert', 'value': value} for value in pattern.findall(text_lower))
             
             # If no specific operations found, create realistic tree operations based on code
             if not operations:
                 # Check if it's a typical BST example
-                if any(word in text_lower for word in ['50', '30', '70', '20', '40', '60', '80']):
+                if any(word in present for word in ['50', '30', '70', '20', '40', '60', '80']):
                     # Use common BST example values
-                    operations = [
-                        {'type': 'tree_insert', 'value': '50'},
-                        {'type': 'tree_insert', 'value': '30'},
-                        {'type': 'tree_insert', 'value': '70'},
-                        {'type': 'tree_insert', 'value': '20'},
-                        {'type': 'tree_insert', 'value': '40'},
-                        {'type': 'tree_insert', 'value': '60'},
-                        {'type': 'tree_insert', 'value': '80'}
-                    ]
+                    operations = _sample_operations('bst')
                 else:
                     # Generic tree operations
-                    operations = [
-                        {'type': 'tree_insert', 'value': '10'},
-                        {'type': 'tree_insert', 'value': '5'},
-                        {'type': 'tree_insert', 'value': '15'},
-                        {'type': 'tree_insert', 'value': '3'},
-                        {'type': 'tree_insert', 'value': '7'},
-                        {'type': 'tree_insert', 'value': '12'},
-                        {'type': 'tree_insert', 'value': '18'}
-                    ]
+                    operations = _sample_operations('tree')
         
         # Linked List operations
-        elif any(word in text_lower for word in ['linked list', 'linkedlist', 'list']):
-            insert_matches = re.findall(r'insert\s*\(?\s*(\w+)\s*\)?', text, re.IGNORECASE)
-            for value in insert_matches:
-                operations.append({'type': 'list_insert', 'value': value})
-            
-            append_matches = re.findall(r'append\s*\(?\s*(\w+)\s*\)?', text, re.IGNORECASE)
-            for value in append_matches:
-                operations.append({'type': 'list_append', 'value': value})
-            
-            delete_matches = re.findall(r'delete\s*\(\s*\)', text, re.IGNORECASE)
-            for _ in delete_matches:
-                operations.append({'type': 'list_delete'})
+        elif any(word in present for word in ['linked list', 'linkedlist', 'list']):
+            operations.extend({'type': 'list_insert', 'value': value} for value in _LIST_INSERT_PAT.findall(text))
+            operations.extend({'type': 'list_append', 'value': value} for value in _LIST_APPEND_PAT.findall(text))
+            operations.extend({'type': 'list_delete'} for _ in _LIST_DELETE_PAT.finditer(text))
             
             # If no specific operations found, create sample list operations
             if not operations:
-                operations = [
-                    {'type': 'list_insert', 'value': '10'},
-                    {'type': 'list_append', 'value': '20'},
-                    {'type': 'list_insert', 'value': '5'},
-                    {'type': 'list_delete'}
-                ]
+                operations = _sample_operations('list')
         
         # Graph operations
-        elif 'graph' in text_lower:
+        elif 'graph' in present:
             # Add node operations
-            node_matches = re.findall(r'add.*node\s*\(?\s*(\w+)\s*\)?', text, re.IGNORECASE)
-            for node in node_matches:
-                operations.append({'type': 'graph_add_node', 'node': node})
+            operations.extend({'type': 'graph_add_node', 'node': node} for node in _GRAPH_NODE_PAT.findall(text))
             
             # Add edge operations
-            edge_matches = re.findall(r'add.*edge\s*\(?\s*(\w+)\s*,\s*(\w+)\s*\)?', text, re.IGNORECASE)
-            for match in edge_matches:
-                operations.append({'type': 'graph_add_edge', 'from_node': match[0], 'to_node': match[1]})
+            operations.extend({'type': 'graph_add_edge', 'from_node': from_node, 'to_node': to_node}
+                              for from_node, to_node in _GRAPH_EDGE_PAT.findall(text))
             
             # DFS/BFS operations
-            if 'dfs' in text_lower or 'depth.*first' in text_lower:
+            if 'dfs' in present or 'depth.*first' in present:
                 operations.append({'type': 'graph_dfs', 'node': 'A'})
-            elif 'bfs' in text_lower or 'breadth.*first' in text_lower:
+            elif 'bfs' in present or 'breadth.*first' in present:
                 operations.append({'type': 'graph_bfs', 'node': 'A'})
             
             # If no specific operations found, create sample graph operations
             if not operations:
-                operations = [
-                    {'type': 'graph_add_node', 'node': 'A'},
-                    {'type': 'graph_add_node', 'node': 'B'},
-                    {'type': 'graph_add_node', 'node': 'C'},
-                    {'type': 'graph_add_edge', 'from_node': 'A', 'to_node': 'B'},
-                    {'type': 'graph_add_edge', 'from_node': 'B', 'to_node': 'C'},
-                    {'type': 'graph_dfs', 'node': 'A'}
-                ]
+                operations = _sample_operations('graph')
         
         # Hash Table operations
-        elif any(word in text_lower for word in ['hash', 'hash table', 'hashtable']):
-            insert_matches = re.findall(r'insert\s*\(?\s*(\w+)\s*\)?', text, re.IGNORECASE)
-            for value in insert_matches:
-                operations.append({'type': 'hash_insert', 'key': value})
-            
-            search_matches = re.findall(r'search\s*\(?\s*(\w+)\s*\)?', text, re.IGNORECASE)
-            for value in search_matches:
-                operations.append({'type': 'hash_search', 'key': value})
-            
-            delete_matches = re.findall(r'delete\s*\(?\s*(\w+)\s*\)?', text, re.IGNORECASE)
-            for value in delete_matches:
-                operations.append({'type': 'hash_delete', 'key': value})
+        elif any(word in present for word in ['hash', 'hash table', 'hashtable']):
+            operations.extend({'type': 'hash_insert', 'key': value} for value in _HASH_INSERT_PAT.findall(text))
+            operations.extend({'type': 'hash_search', 'key': value} for value in _HASH_SEARCH_PAT.findall(text))
+            operations.extend({'type': 'hash_delete', 'key': value} for value in _HASH_DELETE_PAT.findall(text))
             
             # If no specific operations found, create sample hash operations
             if not operations:
-                operations = [
-                    {'type': 'hash_insert', 'key': 'John'},
-                    {'type': 'hash_insert', 'key': 'Jane'},
-                    {'type': 'hash_search', 'key': 'John'},
-                    {'type': 'hash_insert', 'key': 'Bob'},
-                    {'type': 'hash_delete', 'key': 'Jane'}
-                ]
+                operations = _sample_operations('hash')
         
         # Array operations
-        elif 'array' in text_lower:
-            insert_matches = re.findall(r'insert\s*\(\s*(\d+)\s*,?\s*(\d+)?\s*\)', text, re.IGNORECASE)
-            for match in insert_matches:
-                operations.append({'type': 'array_insert', 'value': match[0], 'index': match[1] or '0'})
-            
-            append_matches = re.findall(r'append\s*\(\s*(\d+)\s*\)', text, re.IGNORECASE)
-            for value in append_matches:
-                operations.append({'type': 'array_append', 'value': value})
-            
-            delete_matches = re.findall(r'delete\s*\(\s*(\d+)?\s*\)', text, re.IGNORECASE)
-            for match in delete_matches:
-                operations.append({'type': 'array_delete', 'index': match or '0'})
+        elif 'array' in present:
+            operations.extend({'type': 'array_insert', 'value': value, 'index': index or '0'}
+                              for value, index in _ARRAY_INSERT_PAT.findall(text_lower))
+            operations.extend({'type': 'array_append', 'value': value} for value in _ARRAY_APPEND_PAT.findall(text_lower))
+            operations.extend({'type': 'array_delete', 'index': index or '0'}
+                              for index in _ARRAY_DELETE_PAT.findall(text_lower))
             
             # If no specific operations found, create sample array operations
             if not operations:
-                operations = [
-                    {'type': 'array_append', 'value': '10'},
-                    {'type': 'array_append', 'value': '20'},
-                    {'type': 'array_insert', 'value': '15', 'index': '1'},
-                    {'type': 'array_delete', 'index': '0'}
-                ]
+                operations = _sample_operations('array')
         
         # Enhanced fallback: Look for numbered operations or sequences
         if not operations:
             # Try to extract from numbered lists like "1. push(10)" or "- Add 5"
-            numbered_operations = re.findall(r'(?:^\d+\.|\-|\*)\s*(.+)', text, re.MULTILINE | re.IGNORECASE)
+            numbered_operations = _NUMBERED_OP_PAT.findall(text)
             
             for op_text in numbered_operations:
-                if 'stack' in text_lower or any(word in op_text.lower() for word in ['push', 'pop']):
+                op_lower = op_text.lower()
+                if 'stack' in present or any(word in op_lower for word in ['push', 'pop']):
                     # Look for push operations in numbered lists
-                    push_match = re.search(r'(?:push|add|insert).*?(\d+|[A-Za-z]+)', op_text, re.IGNORECASE)
+                    push_match = _NUMBERED_PUSH_PAT.search(op_text)
                     if push_match:
                         operations.append({'type': 'stack_push', 'value': push_match.group(1)})
-                    elif re.search(r'(?:pop|remove|delete)', op_text, re.IGNORECASE):
+                    elif _NUMBERED_POP_PAT.search(op_lower):
                         operations.append({'type': 'stack_pop'})
                 
-                elif 'queue' in text_lower or any(word in op_text.lower() for word in ['enqueue', 'dequeue']):
+                elif 'queue' in present or any(word in op_lower for word in ['enqueue', 'dequeue']):
                     # Look for enqueue operations in numbered lists
-                    enqueue_match = re.search(r'(?:enqueue|add|insert|put).*?(\d+|[A-Za-z]+)', op_text, re.IGNORECASE)
+                    enqueue_match = _NUMBERED_ENQUEUE_PAT.search(op_text)
                     if enqueue_match:
                         operations.append({'type': 'queue_enqueue', 'value': enqueue_match.group(1)})
-                    elif re.search(r'(?:dequeue|remove|take)', op_text, re.IGNORECASE):
+                    elif _NUMBERED_DEQUEUE_PAT.search(op_lower):
                         operations.append({'type': 'queue_dequeue'})
         
         # If still no operations found, create operations with extracted values from text
         if not operations:
             # Try to extract any numbers or values from the text
-            all_values = re.findall(r'\b(\d+|[A-Z])\b', text)
-            unique_values = list(dict.fromkeys(all_values))  # Remove duplicates while preserving order
-            
+            # Only the first 4 distinct values are ever used, so dedup lazily
+            # and stop scanning once we have them
+            unique_values = []
+            seen = set()
+            for match in _VALUE_TOKEN_PAT.finditer(text):
+                value = match.group(1)
+                if value not in seen:
+                    seen.add(value)
+                    unique_values.append(value)
+                    if len(unique_values) == 4:
+                        break
+
             if unique_values and len(unique_values) >= 2:
                 # Determine if it's stack or queue based on keywords
-                if 'stack' in text_lower or any(word in text_lower for word in ['push', 'pop', 'lifo']):
+                if 'stack' in present or any(word in present for word in ['push', 'pop', 'lifo']):
                     operations = []
                     for i, value in enumerate(unique_values[:4]):  # Use first 4 values
                         operations.append({'type': 'stack_push', 'value': value})
@@ -405,7 +555,7 @@ class ContentAnalyzer:
                     if len(operations) > 1:
                         operations.append({'type': 'stack_pop'})
                         
-                elif 'queue' in text_lower or any(word in text_lower for word in ['enqueue', 'dequeue', 'fifo']):
+                elif 'queue' in present or any(word in present for word in ['enqueue', 'dequeue', 'fifo']):
                     operations = []
                     for i, value in enumerate(unique_values[:4]):
                         operations.append({'type': 'queue_enqueue', 'value': value})
@@ -421,44 +571,30 @@ class ContentAnalyzer:
                     operations.append({'type': 'stack_pop'})
             else:
                 # Final fallback with default values only if no values found in text
-                if 'stack' in text_lower or any(word in text_lower for word in ['push', 'pop', 'lifo']):
-                    operations = [
-                        {'type': 'stack_push', 'value': '10'},
-                        {'type': 'stack_push', 'value': '20'},
-                        {'type': 'stack_pop'},
-                        {'type': 'stack_push', 'value': '30'}
-                    ]
-                elif 'queue' in text_lower or any(word in text_lower for word in ['enqueue', 'dequeue', 'fifo']):
-                    operations = [
-                        {'type': 'queue_enqueue', 'value': 'A'},
-                        {'type': 'queue_enqueue', 'value': 'B'},
-                        {'type': 'queue_dequeue'},
-                        {'type': 'queue_enqueue', 'value': 'C'}
-                    ]
-                elif any(word in text_lower for word in ['data structure', 'push', 'pop', 'insert', 'delete']):
+                if 'stack' in present or any(word in present for word in ['push', 'pop', 'lifo']):
+                    operations = _sample_operations('stack')
+                elif 'queue' in present or any(word in present for word in ['enqueue', 'dequeue', 'fifo']):
+                    operations = _sample_operations('queue')
+                elif any(word in present for word in ['data structure', 'push', 'pop', 'insert', 'delete']):
                     # Default to stack for general data structure content
-                    operations = [
-                        {'type': 'stack_push', 'value': '10'},
-                        {'type': 'stack_push', 'value': '20'},
-                        {'type': 'stack_pop'},
-                        {'type': 'stack_push', 'value': '30'}
-                    ]
+                    operations = _sample_operations('stack')
         
         return operations
     
-    def _extract_algorithm_steps(self, text: str) -> List[Dict]:
+    def _extract_algorithm_steps(self, text: str, text_lower: Optional[str] = None) -> List[Dict]:
         """Extract algorithm steps for visualization"""
         steps = []
+        if text_lower is None:
+            text_lower = text.lower()
         
         # Look for sorting algorithms
-        if any(word in text.lower() for word in ['sort', 'bubble', 'merge', 'quick']):
+        if any(word in text_lower for word in ['sort', 'bubble', 'merge', 'quick']):
             # Extract array elements if present
-            array_pattern = r'\[([^\]]+)\]'
-            arrays = re.findall(array_pattern, text)
+            array_match = _ARRAY_LITERAL_PAT.search(text)
             
-            if arrays:
+            if array_match:
                 # Use first array found
-                elements = [x.strip() for x in arrays[0].split(',')]
+                elements = _CSV_SPLIT_PAT.split(array_match.group(1).strip())
                 steps = [{'type': 'sort_step', 'array': elements[:], 'step': i} for i in range(len(elements))]
             else:
                 # Default sorting example
@@ -467,77 +603,77 @@ class ContentAnalyzer:
         
         return steps
     
-    def _extract_math_concepts(self, text: str) -> List[Dict]:
+    def _extract_math_concepts(self, text: str, text_lower: Optional[str] = None) -> List[Dict]:
         """Extract mathematical concepts for visualization using enhanced analyzer"""
-        try:
-            from .enhanced_concept_analyzers import EnhancedMathematicsAnalyzer
-            math_analyzer = EnhancedMathematicsAnalyzer()
-            return math_analyzer.extract_math_concepts(text)
-        except ImportError:
-            # Fallback to original method
-            concepts = []
-            
-            # Look for equations
-            equations = re.findall(r'([^=]+=[^=\n]+)', text)
-            for eq in equations:
-                concepts.append({'type': 'equation', 'expression': eq.strip()})
-            
-            # Look for functions
-            functions = re.findall(r'f\(x\)\s*=\s*([^\n]+)', text)
-            for func in functions:
-                concepts.append({'type': 'function', 'expression': func.strip()})
-            
-            # Look for geometric shapes
-            if any(word in text.lower() for word in ['circle', 'triangle', 'rectangle', 'square']):
-                concepts.append({'type': 'geometry', 'shapes': ['circle', 'triangle', 'rectangle']})
-            
-            return concepts
+        if _MATH_ANALYZER is not None:
+            return _MATH_ANALYZER.extract_math_concepts(text)
+        
+        # Fallback to original method
+        concepts = []
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        # Look for equations
+        equations = re.findall(r'([^=]+=[^=\n]+)', text)
+        for eq in equations:
+            concepts.append({'type': 'equation', 'expression': eq.strip()})
+        
+        # Look for functions
+        functions = re.findall(r'f\(x\)\s*=\s*([^\n]+)', text)
+        for func in functions:
+            concepts.append({'type': 'function', 'expression': func.strip()})
+        
+        # Look for geometric shapes
+        if any(word in text_lower for word in ['circle', 'triangle', 'rectangle', 'square']):
+            concepts.append({'type': 'geometry', 'shapes': ['circle', 'triangle', 'rectangle']})
+        
+        return concepts
     
-    def _extract_physics_concepts(self, text: str) -> List[Dict]:
+    def _extract_physics_concepts(self, text: str, text_lower: Optional[str] = None) -> List[Dict]:
         """Extract physics concepts for visualization using enhanced analyzer"""
-        try:
-            from .enhanced_concept_analyzers import EnhancedPhysicsAnalyzer
-            physics_analyzer = EnhancedPhysicsAnalyzer()
-            return physics_analyzer.extract_physics_concepts(text)
-        except ImportError:
-            # Fallback to original method
-            concepts = []
-            
-            # Motion concepts
-            if any(word in text.lower() for word in ['motion', 'velocity', 'acceleration']):
-                concepts.append({'type': 'motion', 'concept': 'kinematic'})
-            
-            # Force concepts
-            if any(word in text.lower() for word in ['force', 'newton', 'gravity']):
-                concepts.append({'type': 'force', 'concept': 'dynamics'})
-            
-            return concepts
+        if _PHYSICS_ANALYZER is not None:
+            return _PHYSICS_ANALYZER.extract_physics_concepts(text)
+        
+        # Fallback to original method
+        concepts = []
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        # Motion concepts
+        if any(word in text_lower for word in ['motion', 'velocity', 'acceleration']):
+            concepts.append({'type': 'motion', 'concept': 'kinematic'})
+        
+        # Force concepts
+        if any(word in text_lower for word in ['force', 'newton', 'gravity']):
+            concepts.append({'type': 'force', 'concept': 'dynamics'})
+        
+        return concepts
     
-    def _extract_chemistry_concepts(self, text: str) -> List[Dict]:
+    def _extract_chemistry_concepts(self, text: str, text_lower: Optional[str] = None) -> List[Dict]:
         """Extract chemistry concepts for visualization using enhanced analyzer""" 
-        try:
-            from .enhanced_concept_analyzers import EnhancedChemistryAnalyzer
-            chemistry_analyzer = EnhancedChemistryAnalyzer()
-            return chemistry_analyzer.extract_chemistry_concepts(text)
-        except ImportError:
-            # Fallback method
-            concepts = []
-            if any(word in text.lower() for word in ['reaction', 'molecule', 'atom', 'bond']):
-                concepts.append({'type': 'chemical_reaction', 'concept': 'basic'})
-            return concepts
+        if _CHEMISTRY_ANALYZER is not None:
+            return _CHEMISTRY_ANALYZER.extract_chemistry_concepts(text)
+        
+        # Fallback method
+        concepts = []
+        if text_lower is None:
+            text_lower = text.lower()
+        if any(word in text_lower for word in ['reaction', 'molecule', 'atom', 'bond']):
+            concepts.append({'type': 'chemical_reaction', 'concept': 'basic'})
+        return concepts
     
-    def _extract_biology_concepts(self, text: str) -> List[Dict]:
+    def _extract_biology_concepts(self, text: str, text_lower: Optional[str] = None) -> List[Dict]:
         """Extract biology concepts for visualization using enhanced analyzer"""
-        try:
-            from .enhanced_concept_analyzers import EnhancedBiologyAnalyzer
-            biology_analyzer = EnhancedBiologyAnalyzer()
-            return biology_analyzer.extract_biology_concepts(text)
-        except ImportError:
-            # Fallback method
-            concepts = []
-            if any(word in text.lower() for word in ['cell', 'dna', 'organism', 'evolution']):
-                concepts.append({'type': 'biological_process', 'concept': 'basic'})
-            return concepts
+        if _BIOLOGY_ANALYZER is not None:
+            return _BIOLOGY_ANALYZER.extract_biology_concepts(text)
+        
+        # Fallback method
+        concepts = []
+        if text_lower is None:
+            text_lower = text.lower()
+        if any(word in text_lower for word in ['cell', 'dna', 'organism', 'evolution']):
+            concepts.append({'type': 'biological_process', 'concept': 'basic'})
+        return concepts
     
     def _extract_process_steps(self, text: str) -> List[Dict]:
         """Extract business process steps"""
@@ -552,10 +688,351 @@ class ContentAnalyzer:
     
     def _extract_general_concepts(self, text: str) -> List[Dict]:
         """Extract general concepts for basic visualization"""
-        # Split into sentences for slide-based animation
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
-        return [{'type': 'text_slide', 'content': sentence} for sentence in sentences]
+        # Split into sentences for slide-based animation, dropping OCR fragments
+        # too short to be worth a slide of their own
+        return [{'type': 'text_slide', 'content': sentence}
+                for sentence in _SENTENCE_SPLIT_PAT.split(text.strip()) if len(sentence) > 3]
+
+
+# Recently blitted frames, keyed on the animator and everything it shows, so
+# scenes that recur across videos (the empty initial frame, a re-submitted
+# note) are copied instead of redrawn. At 720p each frame is ~3.7 MB, so the
+# cache is kept small
+_frame_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_frame_cache_size = 32
+_frame_cache_lock = threading.Lock()
+
+
+class _VideoWriter:
+    """Encodes the rendered frames of one figure with ffmpeg as a variable frame rate video.
+
+    Each distinct frame is written once; holding it on screen only lengthens
+    its duration in the ffconcat list, so ffmpeg never encodes repeated frames.
+    """
+
+    def __init__(self, fig, output_path: str, fps: int, width: int, height: int):
+        # The canvas is rendered at exactly the output resolution rather than
+        # a tight bounding box, so every frame has the dimensions of the video.
+        # The figure keeps its width in inches, so text keeps its size
+        # relative to the frame, and only the dpi and height follow.
+        dpi = width / fig.get_figwidth()
+        fig.set_dpi(dpi)
+        fig.set_size_inches(fig.get_figwidth(), height / dpi)
+        self.fig = fig
+        self.output_path = output_path
+        self.fps = fps
+        self.width, self.height = fig.canvas.get_width_height()
+        self.frame = None
+        self.repeat = 0
+        self.first_frame = None
+        self.background = None
+        # Frames are uncompressed BMPs, kept in RAM (/dev/shm) where available
+        self.frame_dir = tempfile.mkdtemp(prefix='frames_', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+        self.frames = []  # (path, hold) for every distinct frame, in order
+
+    def save_frame(self, hold: int = 1):
+        """Render the current figure once and show it for `hold` video frames"""
+        self._flush()
+        self.fig.canvas.draw()
+        self._set_frame(hold)
+
+    def save_background(self):
+        """Render everything but the animated artists as the base for blit_frame"""
+        self.fig.canvas.draw()
+        self.background = self.fig.canvas.copy_from_bbox(self.fig.bbox)
+
+    def blit_frame(self, artists, hold: int = 1, key: Optional[tuple] = None):
+        """Redraw only `artists` over the saved background and show it for `hold` video frames.
+        
+        `key` identifies everything the frame shows; a frame already blitted
+        under the same key at this size is reused without drawing.
+        """
+        self._flush()
+        if key is not None:
+            key = (self.width, self.height) + key
+            with _frame_cache_lock:
+                frame = _frame_cache.get(key)
+                if frame is not None:
+                    _frame_cache.move_to_end(key)
+            if frame is not None:
+                self._set_frame(hold, frame)
+                return
+        
+        self.fig.canvas.restore_region(self.background)
+        for artist in sorted(artists, key=lambda a: a.get_zorder()):
+            self.fig.draw_artist(artist)
+        self._set_frame(hold)
+        
+        if key is not None:
+            with _frame_cache_lock:
+                _frame_cache[key] = bytes(self.frame)
+                if len(_frame_cache) > _frame_cache_size:
+                    _frame_cache.popitem(last=False)
+
+    def add_frame(self, frame: bytes, hold: int = 1):
+        """Show RGBA pixels rendered elsewhere, such as a worker process, for `hold` video frames"""
+        self._flush()
+        self._set_frame(hold, frame)
+
+    def _set_frame(self, hold: int, frame=None):
+        self.frame = self.fig.canvas.buffer_rgba() if frame is None else frame
+        self.repeat = hold
+        if self.first_frame is None:
+            self.first_frame = bytes(self.frame)
+
+    def hold_frame(self, count: int):
+        """Keep the last saved frame on screen for `count` more video frames"""
+        self.repeat += count
+
+    def _flush(self):
+        """Write the pending frame once, with the number of video frames it is shown for"""
+        if self.repeat:
+            path = os.path.join(self.frame_dir, f'{len(self.frames):05d}.bmp')
+            Image.frombuffer('RGBA', (self.width, self.height), self.frame).save(path)
+            self.frames.append((path, self.repeat))
+        self.repeat = 0
+
+    def close(self):
+        """Encode the video from the saved frames"""
+        self._flush()
+        try:
+            if self._encode():
+                return
+        finally:
+            shutil.rmtree(self.frame_dir, ignore_errors=True)
+
+        # Fallback: save first frame as static image
+        if self.first_frame is not None:
+            Image.frombuffer('RGBA', (self.width, self.height), self.first_frame).save(
+                self.output_path.replace('.mp4', '.png'))
+
+    def _encode(self) -> bool:
+        if not self.frames:
+            return False
+        lines = ['ffconcat version 1.0']
+        for path, hold in self.frames:
+            lines += [f"file '{path}'", f'duration {hold / self.fps}']
+        # The concat demuxer ignores the duration of the last file, which then
+        # lasts one frame; listing it again carries the rest of its hold
+        path, hold = self.frames[-1]
+        lines.pop()
+        if hold > 1:
+            lines += [f'duration {(hold - 1) / self.fps}', f"file '{path}'"]
+        list_path = os.path.join(self.frame_dir, 'frames.ffconcat')
+        with open(list_path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
 
+        try:
+            # Import locally to avoid import conflicts; this is the ffmpeg build MoviePy uses
+            import imageio_ffmpeg
+
+            # B-frames are of no use on held frames and make ffmpeg misreport
+            # the duration of variable frame rate MP4s
+            result = subprocess.run([
+                imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-loglevel', 'error',
+                '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-vsync', 'vfr', '-enc_time_base', f'1/{self.fps}',
+                *h264_encoder_args(), '-bf', '0', '-pix_fmt', 'yuv420p', self.output_path
+            ])
+        except Exception as e:
+            print(f"Error creating video: {e}")
+            return False
+        if result.returncode != 0:
+            print(f"Error creating video: ffmpeg exited with code {result.returncode}")
+            return False
+        return True
+
+
+# The fallback math curve, y = x², the same on every frame
+_MATH_CURVE_X = np.linspace(-3, 3, 100)
+_MATH_CURVE_Y = _MATH_CURVE_X**2
+
+
+def _draw_math_frame(ax, step: int):
+    """Draw one frame of the fallback math animation: a point moving along y = x²"""
+    ax.clear()
+    ax.set_xlim(-10, 10)
+    ax.set_ylim(-10, 10)
+    ax.grid(True, alpha=0.3)
+    ax.set_title('MATHEMATICAL VISUALIZATION', fontsize=20, fontweight='bold')
+
+    # Draw coordinate system
+    ax.axhline(y=0, color='k', linewidth=0.5)
+    ax.axvline(x=0, color='k', linewidth=0.5)
+
+    # Draw a simple function (e.g., y = x^2)
+    ax.plot(_MATH_CURVE_X, _MATH_CURVE_Y, 'b-', linewidth=3, label='y = x²')
+
+    # Animate a point moving along the curve
+    t = step * 0.1
+    if -3 <= t <= 3:
+        point_y = t**2
+        ax.plot(t, point_y, 'ro', markersize=10)
+        ax.text(t, point_y + 1, f'({t:.1f}, {point_y:.1f})', 
+               ha='center', va='bottom', fontsize=12, fontweight='bold')
+
+    ax.legend()
+    ax.set_xlabel('x', fontsize=14)
+    ax.set_ylabel('y', fontsize=14)
+
+
+# Projectile motion parameters of the fallback physics animation: initial
+# velocity, launch angle and gravity, with the launch velocity's components
+_PROJECTILE_V0, _PROJECTILE_ANGLE, _GRAVITY = 8, 45, 9.8
+_PROJECTILE_VX = _PROJECTILE_V0 * math.cos(math.radians(_PROJECTILE_ANGLE))
+_PROJECTILE_VY = _PROJECTILE_V0 * math.sin(math.radians(_PROJECTILE_ANGLE))
+# Sample points of the trajectory drawn so far, as fractions of the elapsed time
+_TRAJECTORY_STEPS = np.linspace(0, 1, 50)
+
+
+def _draw_physics_frame(ax, step: int):
+    """Draw one frame of the fallback physics animation: a projectile in flight"""
+    ax.clear()
+    ax.set_xlim(0, 10)
+    ax.set_ylim(0, 6)
+    ax.set_title('PHYSICS SIMULATION - PROJECTILE MOTION', fontsize=20, fontweight='bold')
+
+    t = step * 0.1
+
+    # Calculate position
+    x = _PROJECTILE_VX * t
+    y = _PROJECTILE_VY * t - 0.5 * _GRAVITY * t**2
+
+    if y >= 0 and x <= 10:
+        # Draw trajectory
+        t_traj = _TRAJECTORY_STEPS * t
+        x_traj = _PROJECTILE_VX * t_traj
+        y_traj = _PROJECTILE_VY * t_traj - 0.5 * _GRAVITY * t_traj**2
+
+        valid_indices = y_traj >= 0
+        ax.plot(x_traj[valid_indices], y_traj[valid_indices], 'b--', alpha=0.5)
+
+        # Draw projectile
+        ax.plot(x, y, 'ro', markersize=15)
+
+        # Add velocity vector
+        vx = _PROJECTILE_VX
+        vy = _PROJECTILE_VY - _GRAVITY * t
+        ax.arrow(x, y, vx/10, vy/10, head_width=0.2, head_length=0.2, fc='red', ec='red')
+
+        # Add text
+        ax.text(1, 5, f'Time: {t:.1f}s', fontsize=14, fontweight='bold')
+        ax.text(1, 4.5, f'Position: ({x:.1f}, {y:.1f})', fontsize=12)
+
+    ax.set_xlabel('Distance (m)', fontsize=14)
+    ax.set_ylabel('Height (m)', fontsize=14)
+    ax.grid(True, alpha=0.3)
+
+
+def _draw_process_frame(ax, step: int):
+    """Draw one frame of the business process animation, with step `step` highlighted"""
+    ax.clear()
+    ax.set_xlim(0, 10)
+    ax.set_ylim(0, 8)
+    ax.set_title('BUSINESS PROCESS FLOW', fontsize=20, fontweight='bold')
+
+    # Draw process steps as boxes
+    steps = ['Start', 'Analysis', 'Decision', 'Implementation', 'Review', 'End']
+    positions = [(1, 4), (3, 4), (5, 4), (7, 4), (5, 2), (9, 4)]
+
+    for i, (name, pos) in enumerate(zip(steps, positions)):
+        color = 'lightgreen' if i == step else 'lightblue'
+        rect = Rectangle((pos[0]-0.5, pos[1]-0.3), 1, 0.6, 
+                       facecolor=color, edgecolor='black', linewidth=2)
+        ax.add_patch(rect)
+        ax.text(pos[0], pos[1], name, ha='center', va='center', 
+               fontsize=10, fontweight='bold')
+
+    # Draw arrows
+    arrow_paths = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (2, 4)]  # Decision branch
+    for start_idx, end_idx in arrow_paths:
+        if start_idx < len(positions) and end_idx < len(positions):
+            start_pos = positions[start_idx]
+            end_pos = positions[end_idx]
+            ax.annotate('', xy=end_pos, xytext=start_pos,
+                       arrowprops=dict(arrowstyle='->', lw=2, color='blue'))
+
+
+# Label boxes shared by every animator; Text.set_bbox copies the dict, so one
+# instance serves every label instead of a new dict per label per frame
+_CYAN_BOX = dict(boxstyle="round,pad=0.3", facecolor="lightcyan")
+_GREEN_BOX = dict(boxstyle="round,pad=0.3", facecolor="lightgreen")
+_YELLOW_BOX = dict(boxstyle="round,pad=0.3", facecolor="lightyellow")
+_GRAY_BOX = dict(boxstyle="round,pad=0.3", facecolor="lightgray")
+_BLUE_BOX = dict(boxstyle="round,pad=0.3", facecolor="lightblue")
+
+_VERTEX_COLORS = ('lightblue', 'lightgreen', 'lightcoral', 'lightyellow',
+                  'lightpink', 'lightcyan', 'wheat')
+
+
+@lru_cache(maxsize=256)
+def _vertex_color(name: str) -> str:
+    """Consistent fill colour for a graph vertex, drawn on every frame"""
+    return _VERTEX_COLORS[hash(name) % len(_VERTEX_COLORS)]
+
+
+def _bubble_sort_trace(array: List[int]):
+    """Bubble sort `array`, yielding each frame to show as
+    (values, comparing, swapping, extra frames to hold it for)"""
+    arr = array[:]
+    n = len(arr)
+    
+    for i in range(n):
+        for j in range(0, n - i - 1):
+            # Show comparison
+            if arr[j] > arr[j + 1]:
+                yield tuple(arr), (j, j + 1), None, 0
+                
+                # Show swap, then the result after it
+                yield tuple(arr), None, (j, j + 1), 0
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                yield tuple(arr), None, None, 30
+            else:
+                yield tuple(arr), (j, j + 1), None, 30
+
+
+# One reusable Agg figure per thread. Animators draw on it in turn instead of
+# allocating a new figure, canvas and renderer for every video; it is kept per
+# thread so concurrent requests never draw on the same figure
+_THREAD_FIGURE = threading.local()
+
+
+def _animation_figure(figsize: Tuple[float, float], margins: Optional[Tuple[float, float, float, float]] = None):
+    """This thread's figure and axes, cleared and sized for a new animation.
+    
+    `margins` are the (left, bottom, right, top) subplot parameters; by default
+    the axes get matplotlib's standard margins.
+    """
+    if not hasattr(_THREAD_FIGURE, 'fig'):
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        _THREAD_FIGURE.fig, _THREAD_FIGURE.ax = fig, fig.add_subplot()
+    fig, ax = _THREAD_FIGURE.fig, _THREAD_FIGURE.ax
+    ax.clear()
+    fig.set_size_inches(figsize)
+    params = SubplotParams() if margins is None else SubplotParams(*margins)
+    fig.subplots_adjust(params.left, params.bottom, params.right, params.top)
+    return fig, ax
+
+
+def _render_frame(draw_frame, figsize: Tuple[float, float], dpi: float, step: int) -> bytes:
+    """Draw one step of an animation in a worker process and return its RGBA pixels"""
+    fig, ax = _animation_figure(figsize)
+    fig.set_dpi(dpi)
+    draw_frame(ax, step)
+    fig.canvas.draw()
+    return bytes(fig.canvas.buffer_rgba())
+
+
+def _worker_context():
+    """Start method for frame workers: forkserver where the platform has it.
+    
+    The workers then start from a clean server process instead of forking
+    this one, which may hold the loaded models and the narration thread.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return None
 
 class UniversalAnimationEngine:
     """Creates animations for any type of content"""
@@ -590,235 +1067,256 @@ class UniversalAnimationEngine:
     
     def _create_data_structure_animation(self, operations: List[Dict], output_path: str) -> str:
         """Create data structure animations"""
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        # Determine structure type from operations
-        if any(op['type'].startswith('stack') for op in operations):
-            return self._animate_stack(operations, output_path)
-        elif any(op['type'].startswith('queue') for op in operations):
-            return self._animate_queue(operations, output_path)
-        elif any(op['type'].startswith('array') for op in operations):
-            return self._animate_array(operations, output_path)
-        elif any(op['type'].startswith('tree') for op in operations):
-            return self._animate_tree(operations, output_path)
-        elif any(op['type'].startswith('list') for op in operations):
-            return self._animate_linked_list(operations, output_path)
-        elif any(op['type'].startswith('graph') for op in operations):
-            return self._animate_graph(operations, output_path)
-        elif any(op['type'].startswith('hash') for op in operations):
-            return self._animate_hash_table(operations, output_path)
-        else:
-            return self._create_general_animation([{'type': 'text_slide', 'content': 'Data Structure Operations'}], output_path)
+        # Determine structure type from operations: collect the type prefixes
+        # in one pass, then take the first structure in priority order
+        prefixes = {op['type'].split('_', 1)[0] for op in operations}
+        for prefix, animate in (
+            ('stack', self._animate_stack),
+            ('queue', self._animate_queue),
+            ('array', self._animate_array),
+            ('tree', self._animate_tree),
+            ('list', self._animate_linked_list),
+            ('graph', self._animate_graph),
+            ('hash', self._animate_hash_table),
+        ):
+            if prefix in prefixes:
+                return animate(operations, output_path)
+        return self._create_general_animation([{'type': 'text_slide', 'content': 'Data Structure Operations'}], output_path)
     
     def _animate_stack(self, operations: List[Dict], output_path: str) -> str:
         """Animate stack operations"""
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig, ax = _animation_figure((12, 8), margins=(0, 0, 1, 1))
         stack = []
-        frames = []
         
         stack_x, stack_width, element_height = 0.4, 0.2, 0.08
         
-        def draw_stack_frame(step_idx, operation=None):
-            ax.clear()
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            
-            # Draw stack container
-            container = Rectangle((stack_x, 0.1), stack_width, 0.8, 
-                                fill=False, edgecolor='black', linewidth=3)
-            ax.add_patch(container)
-            
-            # Stack title
-            ax.text(0.5, 0.95, 'STACK VISUALIZATION', ha='center', va='center', 
-                   fontsize=20, fontweight='bold')
-            ax.text(stack_x + stack_width/2, 0.05, 'STACK', ha='center', va='center', 
-                   fontsize=16, fontweight='bold')
-            
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+        
+        # Draw stack container
+        container = Rectangle((stack_x, 0.1), stack_width, 0.8, 
+                            fill=False, edgecolor='black', linewidth=3)
+        ax.add_patch(container)
+        
+        # Stack title
+        ax.text(0.5, 0.95, 'STACK VISUALIZATION', ha='center', va='center', 
+               fontsize=20, fontweight='bold')
+        ax.text(stack_x + stack_width/2, 0.05, 'STACK', ha='center', va='center', 
+               fontsize=16, fontweight='bold')
+        
+        # Animated artists, updated in place each frame: one slot per push,
+        # the operation banner and the state lines
+        slots = []
+        for i in range(sum(op['type'] == 'stack_push' for op in operations)):
+            y_pos = 0.1 + i * element_height
+            rect = Rectangle((stack_x + 0.01, y_pos), stack_width - 0.02, element_height - 0.01,
+                           facecolor='lightblue', edgecolor='blue', linewidth=2, animated=True)
+            ax.add_patch(rect)
+            label = ax.text(stack_x + stack_width/2, y_pos + element_height/2, '',
+                          ha='center', va='center', fontsize=14, fontweight='bold', animated=True)
+            slots.append((rect, label))
+        op_label = ax.text(0.1, 0.9, '', fontsize=16, fontweight='bold', animated=True,
+                         bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow"))
+        content_label = ax.text(0.1, 0.85, '', fontsize=14, animated=True)
+        size_label = ax.text(0.1, 0.8, '', fontsize=14, animated=True)
+        
+        def draw_stack_frame(operation=None):
             # Draw stack elements
-            for i, element in enumerate(stack):
-                y_pos = 0.1 + i * element_height
-                rect = Rectangle((stack_x + 0.01, y_pos), stack_width - 0.02, element_height - 0.01,
-                               facecolor='lightblue', edgecolor='blue', linewidth=2)
-                ax.add_patch(rect)
-                ax.text(stack_x + stack_width/2, y_pos + element_height/2, str(element),
-                       ha='center', va='center', fontsize=14, fontweight='bold')
+            for i, (rect, label) in enumerate(slots):
+                filled = i < len(stack)
+                rect.set_visible(filled)
+                label.set_visible(filled)
+                if filled:
+                    label.set_text(str(stack[i]))
             
             # Show operation
+            op_label.set_visible(operation is not None)
+            op_text = None
             if operation:
                 op_text = f"Operation: {operation['type'].replace('stack_', '').upper()}"
                 if 'value' in operation:
                     op_text += f"({operation['value']})"
-                ax.text(0.1, 0.9, op_text, fontsize=16, fontweight='bold', 
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="yellow"))
+                op_label.set_text(op_text)
             
             # Show stack state
             stack_content = ' → '.join(map(str, stack)) if stack else 'Empty'
-            ax.text(0.1, 0.85, f'Stack: [{stack_content}]', fontsize=14)
-            ax.text(0.1, 0.8, f'Size: {len(stack)}', fontsize=14)
+            content_label.set_text(f'Stack: [{stack_content}]')
+            size_label.set_text(f'Size: {len(stack)}')
+            
+            video.blit_frame([artist for slot in slots for artist in slot]
+                             + [op_label, content_label, size_label],
+                             key=('stack', tuple(map(str, stack)), op_text))
         
         # Generate animation frames
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        video.save_background()
         
         # Initial frame
-        draw_stack_frame(0)
-        plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-        frame_count += 1
+        draw_stack_frame()
         
-        for i, operation in enumerate(operations):
-            # Show operation about to happen
-            draw_stack_frame(i, operation)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
-            
+        for operation in operations:
             # Execute operation
             if operation['type'] == 'stack_push':
                 stack.append(operation['value'])
             elif operation['type'] == 'stack_pop' and stack:
                 stack.pop()
             
-            # Show result
-            draw_stack_frame(i)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            # Show the result together with the operation that produced it
+            draw_stack_frame(operation)
             
             # Hold frame
-            for _ in range(60):  # 2 seconds at 30fps
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                frame_count += 1
-        
-        plt.close()
+            video.hold_frame(60)  # 2 seconds at 30fps
         
-        # Convert frames to video
-        self._frames_to_video(frame_count, output_path)
+        # Finish encoding the video
+        video.close()
         return output_path
     
     def _animate_queue(self, operations: List[Dict], output_path: str) -> str:
         """Animate queue operations"""
-        fig, ax = plt.subplots(figsize=(12, 8))
-        queue = []
+        fig, ax = _animation_figure((12, 8), margins=(0, 0, 1, 1))
+        queue = deque()
         
         queue_y, queue_height, element_width = 0.4, 0.2, 0.08
         queue_start_x = 0.2
         
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+        
+        # Title
+        ax.text(0.5, 0.95, 'QUEUE VISUALIZATION', ha='center', va='center', 
+               fontsize=20, fontweight='bold')
+        
+        # Draw queue container
+        container = Rectangle((queue_start_x, queue_y), 0.6, queue_height,
+                            fill=False, edgecolor='black', linewidth=3)
+        ax.add_patch(container)
+        
+        # Labels
+        ax.text(queue_start_x - 0.05, queue_y + queue_height/2, 'REAR', 
+               ha='center', va='center', fontsize=12, fontweight='bold', rotation=90)
+        ax.text(queue_start_x + 0.65, queue_y + queue_height/2, 'FRONT', 
+               ha='center', va='center', fontsize=12, fontweight='bold', rotation=90)
+        
+        # Animated artists, updated in place each frame: one slot per enqueue,
+        # the operation banner and the state lines
+        slots = []
+        for i in range(sum(op['type'] == 'queue_enqueue' for op in operations)):
+            x_pos = queue_start_x + 0.01 + i * element_width
+            rect = Rectangle((x_pos, queue_y + 0.01), element_width - 0.01, queue_height - 0.02,
+                           facecolor='lightgreen', edgecolor='green', linewidth=2, animated=True)
+            ax.add_patch(rect)
+            label = ax.text(x_pos + element_width/2, queue_y + queue_height/2, '',
+                          ha='center', va='center', fontsize=12, fontweight='bold', animated=True)
+            slots.append((rect, label))
+        op_label = ax.text(0.1, 0.9, '', fontsize=16, fontweight='bold', animated=True,
+                         bbox=_GREEN_BOX)
+        content_label = ax.text(0.1, 0.85, '', fontsize=14, animated=True)
+        size_label = ax.text(0.1, 0.8, '', fontsize=14, animated=True)
+        
         def draw_queue_frame(operation=None):
-            ax.clear()
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            
-            # Title
-            ax.text(0.5, 0.95, 'QUEUE VISUALIZATION', ha='center', va='center', 
-                   fontsize=20, fontweight='bold')
-            
-            # Draw queue container
-            container = Rectangle((queue_start_x, queue_y), 0.6, queue_height,
-                                fill=False, edgecolor='black', linewidth=3)
-            ax.add_patch(container)
-            
-            # Labels
-            ax.text(queue_start_x - 0.05, queue_y + queue_height/2, 'REAR', 
-                   ha='center', va='center', fontsize=12, fontweight='bold', rotation=90)
-            ax.text(queue_start_x + 0.65, queue_y + queue_height/2, 'FRONT', 
-                   ha='center', va='center', fontsize=12, fontweight='bold', rotation=90)
-            
             # Draw elements
-            for i, element in enumerate(queue):
-                x_pos = queue_start_x + 0.01 + i * element_width
-                rect = Rectangle((x_pos, queue_y + 0.01), element_width - 0.01, queue_height - 0.02,
-                               facecolor='lightgreen', edgecolor='green', linewidth=2)
-                ax.add_patch(rect)
-                ax.text(x_pos + element_width/2, queue_y + queue_height/2, str(element),
-                       ha='center', va='center', fontsize=12, fontweight='bold')
+            for (rect, label), value in zip(slots, queue):
+                rect.set_visible(True)
+                label.set_visible(True)
+                label.set_text(str(value))
+            for rect, label in slots[len(queue):]:
+                rect.set_visible(False)
+                label.set_visible(False)
             
             # Show operation
+            op_label.set_visible(operation is not None)
+            op_text = None
             if operation:
                 op_text = f"Operation: {operation['type'].replace('queue_', '').upper()}"
                 if 'value' in operation:
                     op_text += f"({operation['value']})"
-                ax.text(0.1, 0.9, op_text, fontsize=16, fontweight='bold',
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgreen"))
+                op_label.set_text(op_text)
             
             # Show queue state
             queue_content = ' → '.join(map(str, queue)) if queue else 'Empty'
-            ax.text(0.1, 0.85, f'Queue: [{queue_content}]', fontsize=14)
-            ax.text(0.1, 0.8, f'Size: {len(queue)}', fontsize=14)
+            content_label.set_text(f'Queue: [{queue_content}]')
+            size_label.set_text(f'Size: {len(queue)}')
+            
+            video.blit_frame([artist for slot in slots for artist in slot]
+                             + [op_label, content_label, size_label],
+                             key=('queue', tuple(map(str, queue)), op_text))
         
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        video.save_background()
         
         # Initial frame
         draw_queue_frame()
-        plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-        frame_count += 1
         
         for operation in operations:
-            # Show operation
-            draw_queue_frame(operation)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
-            
             # Execute operation
             if operation['type'] == 'queue_enqueue':
                 queue.append(operation['value'])
             elif operation['type'] == 'queue_dequeue' and queue:
-                queue.pop(0)
+                queue.popleft()
             
-            # Show result
-            draw_queue_frame()
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            # Show the result together with the operation that produced it
+            draw_queue_frame(operation)
             
             # Hold frame
-            for _ in range(60):
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                frame_count += 1
+            video.hold_frame(60)
         
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_array(self, operations: List[Dict], output_path: str) -> str:
         """Animate array operations"""
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig, ax = _animation_figure((12, 8), margins=(0, 0, 1, 1))
         array = []
         max_size = 10
         
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+        
+        # Title
+        ax.text(0.5, 0.95, 'ARRAY VISUALIZATION', ha='center', va='center', 
+               fontsize=20, fontweight='bold')
+        
+        # Draw array container
+        array_y, array_height, element_width = 0.4, 0.2, 0.06
+        array_start_x = 0.1
+        
+        # Draw array cells; the filled cells share one animated collection
+        # whose colors are toggled each frame, and the value of each index is
+        # an animated text updated in place
+        cells, labels = [], []
+        for i in range(max_size):
+            x_pos = array_start_x + i * element_width
+            rect = Rectangle((x_pos, array_y), element_width, array_height,
+                           fill=False, edgecolor='black', linewidth=2)
+            ax.add_patch(rect)
+            
+            # Index labels
+            ax.text(x_pos + element_width/2, array_y - 0.05, str(i),
+                   ha='center', va='center', fontsize=10)
+            
+            cells.append(Rectangle((x_pos + 0.002, array_y + 0.002), 
+                                   element_width - 0.004, array_height - 0.004))
+            labels.append(ax.text(x_pos + element_width/2, array_y + array_height/2, '',
+                                ha='center', va='center', fontsize=12, fontweight='bold', animated=True))
+        filled_cells = ax.add_collection(PatchCollection(cells, animated=True))
+        op_label = ax.text(0.1, 0.9, '', fontsize=16, fontweight='bold', animated=True,
+                         bbox=_BLUE_BOX)
+        content_label = ax.text(0.1, 0.85, '', fontsize=14, animated=True)
+        size_label = ax.text(0.1, 0.8, '', fontsize=14, animated=True)
+        
         def draw_array_frame(operation=None):
-            ax.clear()
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            
-            # Title
-            ax.text(0.5, 0.95, 'ARRAY VISUALIZATION', ha='center', va='center', 
-                   fontsize=20, fontweight='bold')
-            
-            # Draw array container
-            array_y, array_height, element_width = 0.4, 0.2, 0.06
-            array_start_x = 0.1
-            
-            # Draw array cells
-            for i in range(max_size):
-                x_pos = array_start_x + i * element_width
-                rect = Rectangle((x_pos, array_y), element_width, array_height,
-                               fill=False, edgecolor='black', linewidth=2)
-                ax.add_patch(rect)
-                
-                # Index labels
-                ax.text(x_pos + element_width/2, array_y - 0.05, str(i),
-                       ha='center', va='center', fontsize=10)
-                
-                # Array elements
-                if i < len(array):
-                    # Filled cell
-                    filled_rect = Rectangle((x_pos + 0.002, array_y + 0.002), 
-                                          element_width - 0.004, array_height - 0.004,
-                                          facecolor='lightblue', edgecolor='blue')
-                    ax.add_patch(filled_rect)
-                    ax.text(x_pos + element_width/2, array_y + array_height/2, str(array[i]),
-                           ha='center', va='center', fontsize=12, fontweight='bold')
+            # Array elements
+            filled_cells.set_facecolor(['lightblue'] * len(array) + ['none'] * (max_size - len(array)))
+            filled_cells.set_edgecolor(['blue'] * len(array) + ['none'] * (max_size - len(array)))
+            for i, label in enumerate(labels):
+                label.set_text(str(array[i]) if i < len(array) else '')
             
             # Show operation
+            op_label.set_visible(operation is not None)
+            op_text = None
             if operation:
                 op_text = f"Operation: {operation['type'].replace('array_', '').upper()}"
                 if 'value' in operation:
@@ -826,28 +1324,24 @@ class UniversalAnimationEngine:
                     if 'index' in operation:
                         op_text += f", {operation['index']}"
                     op_text += ")"
-                ax.text(0.1, 0.9, op_text, fontsize=16, fontweight='bold',
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue"))
+                op_label.set_text(op_text)
             
             # Show array state
             array_content = ', '.join(map(str, array)) if array else 'Empty'
-            ax.text(0.1, 0.85, f'Array: [{array_content}]', fontsize=14)
-            ax.text(0.1, 0.8, f'Size: {len(array)}/{max_size}', fontsize=14)
+            content_label.set_text(f'Array: [{array_content}]')
+            size_label.set_text(f'Size: {len(array)}/{max_size}')
+            
+            video.blit_frame([filled_cells, *labels, op_label, content_label, size_label],
+                             key=('array', tuple(map(str, array)), op_text))
         
         # Generate animation frames
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        video.save_background()
         
         # Initial frame
         draw_array_frame()
-        plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-        frame_count += 1
         
-        for i, operation in enumerate(operations):
-            # Show operation about to happen
-            draw_array_frame(operation)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
-            
+        for operation in operations:
             # Execute operation
             if operation['type'] == 'array_insert':
                 value = operation['value']
@@ -861,23 +1355,18 @@ class UniversalAnimationEngine:
             elif operation['type'] == 'array_append' and len(array) < max_size:
                 array.append(operation['value'])
             
-            # Show result
-            draw_array_frame()
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
+            # Show the result together with the operation that produced it
+            draw_array_frame(operation)
             
             # Hold frame
-            for _ in range(60):  # 2 seconds at 30fps
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                frame_count += 1
+            video.hold_frame(60)  # 2 seconds at 30fps
         
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_tree(self, operations: List[Dict], output_path: str) -> str:
         """Animate binary tree operations with proper tree structure visualization"""
-        fig, ax = plt.subplots(figsize=(14, 10))
+        fig, ax = _animation_figure((14, 10), margins=(0, 0, 1, 1))
         
         class TreeNode:
             def __init__(self, value):
@@ -889,6 +1378,7 @@ class UniversalAnimationEngine:
                 self.level = 0
         
         root = None
+        nodes, height, inorder_text = [], 0, ''
         
         def insert_node(root, value):
             if root is None:
@@ -899,42 +1389,28 @@ class UniversalAnimationEngine:
                 root.right = insert_node(root.right, value)
             return root
         
-        def calculate_tree_layout(node, level=0):
-            """Calculate proper tree layout with levels"""
-            if node is None:
-                return []
-            
-            nodes_at_level = []
-            node.level = level
-            nodes_at_level.append(node)
-            
-            # Get all nodes at each level
-            if node.left:
-                nodes_at_level.extend(calculate_tree_layout(node.left, level + 1))
-            if node.right:
-                nodes_at_level.extend(calculate_tree_layout(node.right, level + 1))
-            
-            return nodes_at_level
-        
-        def position_nodes(node, x_min, x_max, y):
-            """Position nodes with proper spacing"""
-            if node is None:
-                return
-            
-            # Position current node at center of available space
-            node.x = (x_min + x_max) / 2
-            node.y = y
-            
-            # Calculate space for children
-            mid = (x_min + x_max) / 2
-            
-            # Position left subtree
-            if node.left:
-                position_nodes(node.left, x_min, mid, y - 0.15)
-            
-            # Position right subtree  
-            if node.right:
-                position_nodes(node.right, mid, x_max, y - 0.15)
+        def layout_tree(root):
+            """Position and level every node in one iterative walk.
+            
+            Returns the nodes in inorder and the tree height.
+            """
+            ordered, height = [], 0
+            stack = []
+            node, x_min, x_max, y, level = root, 0.1, 0.9, 0.8, 0
+            while node is not None or stack:
+                # Place the node at the center of its space and descend left,
+                # leaving the right half of the space on the stack
+                while node is not None:
+                    node.x = (x_min + x_max) / 2
+                    node.y = y
+                    node.level = level
+                    height = max(height, level + 1)
+                    stack.append((node, x_max))
+                    node, x_max, y, level = node.left, node.x, y - 0.15, level + 1
+                node, x_max = stack.pop()
+                ordered.append(node)
+                node, x_min, y, level = node.right, node.x, node.y - 0.15, node.level + 1
+            return ordered, height
         
         def draw_tree_frame(operation=None, highlight_node=None, step_info=""):
             ax.clear()
@@ -947,45 +1423,23 @@ class UniversalAnimationEngine:
                    fontsize=18, fontweight='bold', color='darkblue')
             
             if root:
-                # Position all nodes properly
-                position_nodes(root, 0.1, 0.9, 0.8)
-                
-                # First draw all edges
-                def draw_edges(node):
-                    if node is None:
-                        return
-                    
-                    if node.left:
-                        # Draw edge to left child
-                        ax.plot([node.x, node.left.x], [node.y, node.left.y], 
-                               'darkblue', linewidth=3, alpha=0.7)
-                        draw_edges(node.left)
-                    
-                    if node.right:
-                        # Draw edge to right child
-                        ax.plot([node.x, node.right.x], [node.y, node.right.y], 
-                               'darkblue', linewidth=3, alpha=0.7)
-                        draw_edges(node.right)
+                # First draw all edges, as one collection; it keeps the line
+                # zorder the per-edge plots had
+                ax.add_collection(LineCollection(
+                    [[(node.x, node.y), (child.x, child.y)]
+                     for node in nodes for child in (node.left, node.right) if child],
+                    colors='darkblue', linewidths=3, alpha=0.7, zorder=2))
+                
+                # Then draw all nodes: the circles as one collection, then the labels
+                colors = [('gold', 'orange') if highlight_node == int(node.value)
+                          else ('lightblue', 'darkblue') for node in nodes]
+                ax.add_collection(PatchCollection(
+                    [Circle((node.x, node.y), 0.04) for node in nodes],
+                    facecolors=[color for color, _ in colors],
+                    edgecolors=[edge_color for _, edge_color in colors], linewidths=3))
                 
-                # Then draw all nodes
-                def draw_nodes(node):
-                    if node is None:
-                        return
-                    
-                    # Determine node color
-                    if highlight_node == int(node.value):
-                        color = 'gold'
-                        edge_color = 'orange'
-                        text_color = 'darkred'
-                    else:
-                        color = 'lightblue'
-                        edge_color = 'darkblue'
-                        text_color = 'darkblue'
-                    
-                    # Draw node circle
-                    circle = Circle((node.x, node.y), 0.04, facecolor=color, 
-                                  edgecolor=edge_color, linewidth=3)
-                    ax.add_patch(circle)
+                for node in nodes:
+                    text_color = 'darkred' if highlight_node == int(node.value) else 'darkblue'
                     
                     # Draw node value
                     ax.text(node.x, node.y, str(node.value), ha='center', va='center', 
@@ -994,46 +1448,15 @@ class UniversalAnimationEngine:
                     # Draw level indicator
                     ax.text(node.x, node.y - 0.07, f'L{node.level}', ha='center', va='center', 
                            fontsize=8, color='gray', style='italic')
-                    
-                    # Recursively draw children
-                    draw_nodes(node.left)
-                    draw_nodes(node.right)
-                
-                draw_edges(root)
-                draw_nodes(root)
-                
-                # Show tree properties
-                def count_nodes(node):
-                    if node is None:
-                        return 0
-                    return 1 + count_nodes(node.left) + count_nodes(node.right)
-                
-                def tree_height(node):
-                    if node is None:
-                        return 0
-                    return 1 + max(tree_height(node.left), tree_height(node.right))
-                
-                node_count = count_nodes(root)
-                height = tree_height(root)
                 
                 # Display tree statistics
                 ax.text(0.02, 0.15, 'Tree Properties:', fontsize=12, fontweight='bold')
-                ax.text(0.02, 0.12, f'• Nodes: {node_count}', fontsize=10)
+                ax.text(0.02, 0.12, f'• Nodes: {len(nodes)}', fontsize=10)
                 ax.text(0.02, 0.09, f'• Height: {height}', fontsize=10)
                 ax.text(0.02, 0.06, f'• Root: {root.value}', fontsize=10)
                 
                 # Show tree traversal info
-                def inorder_traversal(node, result):
-                    if node:
-                        inorder_traversal(node.left, result)
-                        result.append(node.value)
-                        inorder_traversal(node.right, result)
-                
-                inorder_result = []
-                inorder_traversal(root, inorder_result)
-                
-                ax.text(0.02, 0.02, f'Inorder: {" → ".join(str(x) for x in inorder_result)}', fontsize=9, 
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightyellow"))
+                ax.text(0.02, 0.02, inorder_text, fontsize=9, bbox=_YELLOW_BOX)
                 
             else:
                 # Empty tree visualization
@@ -1055,265 +1478,231 @@ class UniversalAnimationEngine:
             # Show step information
             if step_info:
                 ax.text(0.98, 0.15, step_info, ha='right', va='top', fontsize=10,
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightcyan"))
+                       bbox=_CYAN_BOX)
         
         # Generate animation frames
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
         
         # Initial frame - empty tree
         draw_tree_frame(step_info="Starting with empty tree")
-        plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-        frame_count += 1
+        video.save_frame()
         
         # Hold initial frame
-        for _ in range(30):  # 1 second at 30fps
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+        video.hold_frame(30)  # 1 second at 30fps
         
         for i, operation in enumerate(operations):
             if operation['type'] == 'tree_insert':
                 value = operation['value']
                 
-                # Show operation about to happen
-                step_info = f"Step {i+1}: Inserting {value}"
-                draw_tree_frame(operation, step_info=step_info)
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                frame_count += 1
-                
-                # Hold before insertion
-                for _ in range(45):  # 1.5 seconds
-                    plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                    frame_count += 1
-                
-                # Execute insertion
+                # Execute insertion and position all nodes properly; the layout
+                # only changes here, so frames reuse it until the next insert
                 root = insert_node(root, value)
+                nodes, height = layout_tree(root)
+                # layout_tree already walks in inorder
+                inorder_text = f'Inorder: {" → ".join(str(node.value) for node in nodes)}'
                 
-                # Show result with highlighted new node
+                # Show result with highlighted new node, under the operation
                 step_info = f"✓ Inserted {value} successfully"
-                draw_tree_frame(highlight_node=int(value), step_info=step_info)
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                frame_count += 1
+                draw_tree_frame(operation, highlight_node=int(value), step_info=step_info)
+                video.save_frame()
                 
                 # Hold after insertion
-                for _ in range(60):  # 2 seconds
-                    plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                    frame_count += 1
+                video.hold_frame(105)  # 3.5 seconds
         
         # Final frame showing complete tree
         draw_tree_frame(step_info="Binary Search Tree Complete!")
-        for _ in range(90):  # 3 seconds final view
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+        video.save_frame(hold=90)  # 3 seconds final view
         
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_linked_list(self, operations: List[Dict], output_path: str) -> str:
         """Animate linked list operations with enhanced node structure visualization"""
-        fig, ax = plt.subplots(figsize=(14, 8))
+        # The HEAD badge is centered at x=0.02 and reaches past the left edge of the axes
+        fig, ax = _animation_figure((14, 8), margins=(0.03, 0, 1, 1))
         
         class ListNode:
             def __init__(self, value):
                 self.value = value
                 self.next = None
-                self.x = 0
-                self.y = 0
         
-        head = None
+        # The list in order from head to tail, kept in step with every
+        # operation so neither appends nor frames walk the chain
+        head = tail = None
+        nodes = []
+        max_display_nodes = 8
+        node_width = 0.12
+        node_height = 0.08
+        node_y = 0.5
+        
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+        
+        # Title
+        ax.text(0.5, 0.95, 'LINKED LIST VISUALIZATION', ha='center', va='center', 
+               fontsize=18, fontweight='bold', color='darkgreen')
+        
+        # Animated artists, updated in place each frame: one slot per displayed
+        # node (limited to 8 nodes), the HEAD pointer, the empty-list notice and
+        # the state lines
+        slots = []
+        for i in range(max_display_nodes):
+            x_pos = 0.05 + i * (node_width + 0.03)
+            
+            # Draw node container with data and pointer sections
+            # Data section
+            data_rect = Rectangle((x_pos, node_y), node_width * 0.7, node_height,
+                                facecolor='lightblue', edgecolor='darkblue', linewidth=2, animated=True)
+            ax.add_patch(data_rect)
+            
+            # Pointer section
+            pointer_rect = Rectangle((x_pos + node_width * 0.7, node_y), node_width * 0.3, node_height,
+                                   facecolor='lightgray', edgecolor='darkblue', linewidth=2, animated=True)
+            ax.add_patch(pointer_rect)
+            
+            # Node value in data section
+            value_label = ax.text(x_pos + node_width * 0.35, node_y + node_height/2, '',
+                                ha='center', va='center', fontsize=12, fontweight='bold', color='darkblue',
+                                animated=True)
+            
+            # Node address label
+            address_label = ax.text(x_pos + node_width/2, node_y - 0.03, f'Node{i+1}',
+                                  ha='center', va='center', fontsize=8, color='gray', style='italic',
+                                  animated=True)
+            
+            # Pointer symbol in pointer section: an arrow to the next node, or NULL
+            pointer_label = ax.text(x_pos + node_width * 0.85, node_y + node_height/2, '',
+                                  ha='center', va='center', fontsize=14, fontweight='bold', color='red',
+                                  animated=True)
+            arrow = ax.annotate('', xy=(x_pos + node_width + 0.02, node_y + node_height/2),
+                              xytext=(x_pos + node_width, node_y + node_height/2),
+                              arrowprops=dict(arrowstyle='->', lw=3, color='red'), animated=True)
+            null_label = ax.text(x_pos + node_width + 0.02, node_y + node_height/2, 'NULL',
+                               ha='left', va='center', fontsize=10, style='italic', color='red',
+                               animated=True)
+            slots.append((data_rect, pointer_rect, value_label, address_label, pointer_label, arrow, null_label))
+        
+        # HEAD pointer
+        head_label = ax.text(0.02, 0.7, 'HEAD', ha='center', va='center', fontsize=14, 
+                           fontweight='bold', color='darkgreen',
+                           bbox=_GREEN_BOX, animated=True)
+        head_arrow = ax.annotate('', xy=(0.05, node_y + node_height + 0.02),
+                               xytext=(0.02, 0.65),
+                               arrowprops=dict(arrowstyle='->', lw=2, color='darkgreen'), animated=True)
+        
+        # List traversal info
+        traversal_title = ax.text(0.02, 0.15, 'Traversal:', fontsize=12, fontweight='bold', animated=True)
+        traversal_label = ax.text(0.02, 0.12, '', fontsize=10,
+                                bbox=_YELLOW_BOX, animated=True)
+        
+        # Empty list visualization, with an empty HEAD pointer
+        empty_artists = [
+            ax.text(0.5, 0.5, 'Empty Linked List', ha='center', va='center', 
+                   fontsize=20, style='italic', color='gray', animated=True),
+            ax.text(0.5, 0.45, 'HEAD → NULL', ha='center', va='center', 
+                   fontsize=16, color='gray', animated=True),
+            ax.text(0.02, 0.7, 'HEAD', ha='center', va='center', fontsize=14, 
+                   fontweight='bold', color='gray',
+                   bbox=_GRAY_BOX, animated=True),
+            ax.text(0.02, 0.65, '↓', ha='center', va='center', fontsize=16, color='gray', animated=True),
+            ax.text(0.02, 0.6, 'NULL', ha='center', va='center', fontsize=12, 
+                   style='italic', color='gray', animated=True),
+        ]
+        
+        op_label = ax.text(0.5, 0.88, '', ha='center', va='center', fontsize=16, 
+                         fontweight='bold', bbox=dict(boxstyle="round,pad=0.5", 
+                         facecolor="lightcyan", edgecolor="darkblue"), animated=True)
+        step_label = ax.text(0.98, 0.15, '', ha='right', va='top', fontsize=10,
+                           bbox=_GREEN_BOX, animated=True)
+        
+        # List properties
+        ax.text(0.02, 0.25, 'List Properties:', fontsize=12, fontweight='bold')
+        size_label = ax.text(0.02, 0.22, '', fontsize=10, animated=True)
+        ax.text(0.02, 0.19, f'• Type: Singly Linked', fontsize=10)
         
         def draw_linked_list_frame(operation=None, highlight_value=None, step_info=""):
-            ax.clear()
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            
-            # Title
-            ax.text(0.5, 0.95, 'LINKED LIST VISUALIZATION', ha='center', va='center', 
-                   fontsize=18, fontweight='bold', color='darkgreen')
-            
             # Draw linked list
+            displayed = nodes[:max_display_nodes]
+            for slot, current in zip(slots, displayed):
+                data_rect, pointer_rect, value_label, address_label, pointer_label, arrow, null_label = slot
+                data_rect.set_facecolor('lightblue' if highlight_value != current.value else 'gold')
+                value_label.set_text(str(current.value))
+                pointer_label.set_text('→' if current.next else '∅')
+                arrow.set_visible(current.next is not None)
+                null_label.set_visible(current.next is None)
+                for artist in slot[:5]:
+                    artist.set_visible(True)
+            for slot in slots[len(displayed):]:
+                for artist in slot:
+                    artist.set_visible(False)
+            
+            for artist in (head_label, head_arrow, traversal_title, traversal_label):
+                artist.set_visible(head is not None)
+            for artist in empty_artists:
+                artist.set_visible(head is None)
             if head:
-                current = head
-                x_start = 0.05
-                node_width = 0.12
-                node_height = 0.08
-                y_pos = 0.5
-                pointer_width = 0.04
-                
-                x_pos = x_start
-                node_count = 0
-                
-                # Count total nodes for positioning
-                total_nodes = 0
-                temp = head
-                while temp and total_nodes < 8:  # Limit to 8 nodes for display
-                    total_nodes += 1
-                    temp = temp.next
-                
-                while current and node_count < total_nodes:
-                    current.x = x_pos
-                    current.y = y_pos
-                    
-                    # Draw node container with data and pointer sections
-                    # Data section
-                    data_rect = Rectangle((x_pos, y_pos), node_width * 0.7, node_height,
-                                        facecolor='lightblue' if highlight_value != current.value else 'gold',
-                                        edgecolor='darkblue', linewidth=2)
-                    ax.add_patch(data_rect)
-                    
-                    # Pointer section
-                    pointer_rect = Rectangle((x_pos + node_width * 0.7, y_pos), node_width * 0.3, node_height,
-                                           facecolor='lightgray', edgecolor='darkblue', linewidth=2)
-                    ax.add_patch(pointer_rect)
-                    
-                    # Node value in data section
-                    ax.text(x_pos + node_width * 0.35, y_pos + node_height/2, str(current.value),
-                           ha='center', va='center', fontsize=12, fontweight='bold', color='darkblue')
-                    
-                    # Node address label
-                    ax.text(x_pos + node_width/2, y_pos - 0.03, f'Node{node_count+1}',
-                           ha='center', va='center', fontsize=8, color='gray', style='italic')
-                    
-                    # Draw pointer arrow
-                    if current.next:
-                        # Pointer symbol in pointer section
-                        ax.text(x_pos + node_width * 0.85, y_pos + node_height/2, '→',
-                               ha='center', va='center', fontsize=14, fontweight='bold', color='red')
-                        
-                        # Arrow to next node
-                        arrow_start_x = x_pos + node_width
-                        arrow_end_x = x_pos + node_width + 0.02
-                        ax.annotate('', xy=(arrow_end_x, y_pos + node_height/2),
-                                  xytext=(arrow_start_x, y_pos + node_height/2),
-                                  arrowprops=dict(arrowstyle='->', lw=3, color='red'))
-                    else:
-                        # NULL pointer
-                        ax.text(x_pos + node_width * 0.85, y_pos + node_height/2, '∅',
-                               ha='center', va='center', fontsize=14, fontweight='bold', color='red')
-                        
-                        # NULL label
-                        ax.text(x_pos + node_width + 0.02, y_pos + node_height/2, 'NULL',
-                               ha='left', va='center', fontsize=10, style='italic', color='red')
-                    
-                    current = current.next
-                    x_pos += node_width + 0.03
-                    node_count += 1
-                
-                # Draw HEAD pointer
-                if head:
-                    ax.text(0.02, 0.7, 'HEAD', ha='center', va='center', fontsize=14, 
-                           fontweight='bold', color='darkgreen',
-                           bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgreen"))
-                    ax.annotate('', xy=(head.x, head.y + node_height + 0.02),
-                              xytext=(0.02, 0.65),
-                              arrowprops=dict(arrowstyle='->', lw=2, color='darkgreen'))
-                
                 # Show list traversal info
-                values = []
-                temp = head
-                while temp and len(values) < 8:
-                    values.append(str(temp.value))
-                    temp = temp.next
-                
-                traversal_text = " → ".join(values)
-                if temp:  # More nodes exist
+                traversal_text = " → ".join(str(node.value) for node in displayed)
+                if len(nodes) > max_display_nodes:  # More nodes exist
                     traversal_text += " → ..."
-                
-                ax.text(0.02, 0.15, 'Traversal:', fontsize=12, fontweight='bold')
-                ax.text(0.02, 0.12, traversal_text, fontsize=10,
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightyellow"))
-                
-            else:
-                # Empty list visualization
-                ax.text(0.5, 0.5, 'Empty Linked List', ha='center', va='center', 
-                       fontsize=20, style='italic', color='gray')
-                ax.text(0.5, 0.45, 'HEAD → NULL', ha='center', va='center', 
-                       fontsize=16, color='gray')
-                
-                # Draw empty HEAD pointer
-                ax.text(0.02, 0.7, 'HEAD', ha='center', va='center', fontsize=14, 
-                       fontweight='bold', color='gray',
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray"))
-                ax.text(0.02, 0.65, '↓', ha='center', va='center', fontsize=16, color='gray')
-                ax.text(0.02, 0.6, 'NULL', ha='center', va='center', fontsize=12, 
-                       style='italic', color='gray')
+                traversal_label.set_text(traversal_text)
             
             # Show current operation
+            op_label.set_visible(operation is not None)
             if operation:
                 op_text = f"Operation: {operation['type'].replace('list_', '').upper()}"
                 if 'value' in operation:
                     op_text += f" ({operation['value']})"
-                
-                ax.text(0.5, 0.88, op_text, ha='center', va='center', fontsize=16, 
-                       fontweight='bold', bbox=dict(boxstyle="round,pad=0.5", 
-                       facecolor="lightcyan", edgecolor="darkblue"))
+                op_label.set_text(op_text)
             
             # Show step information
-            if step_info:
-                ax.text(0.98, 0.15, step_info, ha='right', va='top', fontsize=10,
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgreen"))
+            step_label.set_visible(bool(step_info))
+            step_label.set_text(step_info)
             
             # Show list properties
-            size = 0
-            current = head
-            while current:
-                size += 1
-                current = current.next
+            size_label.set_text(f'• Size: {len(nodes)} nodes')
             
-            ax.text(0.02, 0.25, 'List Properties:', fontsize=12, fontweight='bold')
-            ax.text(0.02, 0.22, f'• Size: {size} nodes', fontsize=10)
-            ax.text(0.02, 0.19, f'• Type: Singly Linked', fontsize=10)
+            video.blit_frame([artist for slot in slots for artist in slot]
+                             + [head_label, head_arrow, traversal_title, traversal_label, *empty_artists,
+                                op_label, step_label, size_label])
         
         # Generate animation frames
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        video.save_background()
         
         # Initial frame - empty list
         draw_linked_list_frame(step_info="Starting with empty list")
-        plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-        frame_count += 1
         
         # Hold initial frame
-        for _ in range(30):  # 1 second
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+        video.hold_frame(30)  # 1 second
         
-        for i, operation in enumerate(operations):
-            # Show operation about to happen
-            step_info = f"Step {i+1}: {operation['type'].replace('list_', '').title()}"
-            if 'value' in operation:
-                step_info += f" value {operation['value']}"
-            
-            draw_linked_list_frame(operation, step_info=step_info)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
-            
-            # Hold before operation
-            for _ in range(45):  # 1.5 seconds
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                frame_count += 1
-            
-            # Execute operation
+        for operation in operations:
+            # Execute operation, then show its result under the operation
             if operation['type'] == 'list_insert':
                 value = operation['value']
                 new_node = ListNode(value)
                 
                 if head is None:
-                    head = new_node
+                    head = tail = new_node
                 else:
                     # Insert at beginning for simplicity
                     new_node.next = head
                     head = new_node
+                nodes.insert(0, new_node)
                 
                 # Show result with highlighted node
                 step_info = f"✓ Inserted {value} at head"
-                draw_linked_list_frame(highlight_value=value, step_info=step_info)
+                draw_linked_list_frame(operation, highlight_value=value, step_info=step_info)
                 
             elif operation['type'] == 'list_delete' and head:
                 deleted_value = head.value
                 head = head.next
+                if head is None:
+                    tail = None
+                nodes.pop(0)
                 step_info = f"✓ Deleted {deleted_value} from head"
-                draw_linked_list_frame(step_info=step_info)
+                draw_linked_list_frame(operation, step_info=step_info)
                 
             elif operation['type'] == 'list_append':
                 value = operation['value']
@@ -1322,142 +1711,152 @@ class UniversalAnimationEngine:
                 if head is None:
                     head = new_node
                 else:
-                    current = head
-                    while current.next:
-                        current = current.next
-                    current.next = new_node
+                    tail.next = new_node
+                tail = new_node
+                nodes.append(new_node)
                 
                 step_info = f"✓ Appended {value} to tail"
-                draw_linked_list_frame(highlight_value=value, step_info=step_info)
+                draw_linked_list_frame(operation, highlight_value=value, step_info=step_info)
             else:
-                draw_linked_list_frame()
-                
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+                draw_linked_list_frame(operation)
             
             # Hold after operation
-            for _ in range(60):  # 2 seconds
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                frame_count += 1
+            video.hold_frame(105)  # 3.5 seconds
         
         # Final frame
         draw_linked_list_frame(step_info="Linked List Complete!")
-        for _ in range(90):  # 3 seconds final view
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+        video.hold_frame(89)  # 3 seconds final view
         
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_graph(self, operations: List[Dict], output_path: str) -> str:
         """Animate graph operations with enhanced network topology visualization"""
-        fig, ax = plt.subplots(figsize=(14, 8))
+        fig, ax = _animation_figure((14, 8), margins=(0, 0, 1, 1))
         
         # Graph structure with adjacency list
         nodes = {}
         adjacency = {}
         edge_weights = {}
         visited_order = []
+        visited_set = set()  # The same vertices, for membership tests
+        # Edge geometry from the last layout: (from, to) pairs, their line
+        # segments, midpoints and direction arrow tips
+        edges, edge_segments, edge_mids, edge_tips = [], None, None, None
+        # Property panel text from the last layout
+        is_connected, adj_text = True, ''
+        
+        def layout_graph():
+            """Position every vertex and the edges between them, once per change to the graph"""
+            nonlocal edges, edge_segments, edge_mids, edge_tips, is_connected, adj_text
+            names = list(nodes)
+            count = len(names)
+            if count == 1:
+                # Single node at center
+                xs, ys = np.array([0.5]), np.array([0.5])
+            elif count <= 6:
+                # Arrange in circle for small graphs
+                angles = np.arange(count) * (2 * math.pi / count)
+                xs, ys = 0.5 + 0.25 * np.cos(angles), 0.5 + 0.25 * np.sin(angles)
+            else:
+                # Grid layout for larger graphs
+                grid_size = math.ceil(math.sqrt(count))
+                rows, cols = np.divmod(np.arange(count), grid_size)
+                xs, ys = 0.2 + cols * 0.6 / (grid_size - 1), 0.3 + rows * 0.4 / (grid_size - 1)
+            positions = np.column_stack((xs, ys))
+            nodes.update(zip(names, map(tuple, positions.tolist())))
+            
+            # Edges as index pairs into the positions, with their midpoints and
+            # the tip of the direction arrow just past each midpoint
+            index = {name: i for i, name in enumerate(names)}
+            edges = [(node1, node2) for node1 in adjacency for node2 in adjacency[node1]
+                     if node1 in nodes and node2 in nodes]
+            pairs = np.array([(index[node1], index[node2]) for node1, node2 in edges], dtype=np.intp).reshape(-1, 2)
+            edge_segments = positions[pairs]
+            starts, ends = edge_segments[:, 0], edge_segments[:, 1]
+            edge_mids = (starts + ends) / 2
+            deltas = ends - starts
+            lengths = np.hypot(deltas[:, 0], deltas[:, 1])[:, None]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                edge_tips = np.where(lengths > 0, edge_mids + 0.01 * deltas / lengths, np.nan)
+            
+            # Check if graph is connected (simplified)
+            is_connected = len(nodes) <= 1 or len(adjacency) == len(nodes)
+            
+            # Adjacency list (partial)
+            adj_text = "Adjacency List:"
+            shown_nodes = 0
+            for node in sorted(adjacency.keys()):
+                if shown_nodes >= 4:  # Limit display
+                    adj_text += "\n  ..."
+                    break
+                neighbors = sorted(adjacency[node])
+                adj_text += f"\n  {node}: {neighbors}"
+                shown_nodes += 1
         
-        def hash_string_to_color(s):
-            """Generate consistent color from string"""
-            hash_val = hash(s) % 7
-            colors = ['lightblue', 'lightgreen', 'lightcoral', 'lightyellow', 
-                     'lightpink', 'lightcyan', 'wheat']
-            return colors[hash_val]
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+        
+        # Title
+        ax.text(0.5, 0.95, 'GRAPH NETWORK VISUALIZATION', ha='center', va='center', 
+               fontsize=18, fontweight='bold', color='darkred')
         
         def draw_graph_frame(operation=None, highlight_node=None, visited_nodes=None, step_info=""):
-            ax.clear()
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            
-            # Title
-            ax.text(0.5, 0.95, 'GRAPH NETWORK VISUALIZATION', ha='center', va='center', 
-                   fontsize=18, fontweight='bold', color='darkred')
+            # The layout changes with every vertex, so each frame's artists are
+            # created, blitted over the background and removed again
+            artists = []
             
             if not nodes:
-                ax.text(0.5, 0.5, 'Empty Graph Network', ha='center', va='center', 
-                       fontsize=20, style='italic', color='gray')
-                ax.text(0.5, 0.45, 'No vertices or edges', ha='center', va='center', 
-                       fontsize=14, color='gray')
-                
-                # Show graph properties for empty state
-                ax.text(0.02, 0.2, 'Graph Properties:', fontsize=12, fontweight='bold')
-                ax.text(0.02, 0.17, '• Vertices: 0', fontsize=10)
-                ax.text(0.02, 0.14, '• Edges: 0', fontsize=10)
-                ax.text(0.02, 0.11, '• Type: Undirected', fontsize=10)
-                ax.text(0.02, 0.08, '• Connected: N/A', fontsize=10)
+                artists += [
+                    ax.text(0.5, 0.5, 'Empty Graph Network', ha='center', va='center', 
+                           fontsize=20, style='italic', color='gray'),
+                    ax.text(0.5, 0.45, 'No vertices or edges', ha='center', va='center', 
+                           fontsize=14, color='gray'),
+                    
+                    # Show graph properties for empty state
+                    ax.text(0.02, 0.2, 'Graph Properties:', fontsize=12, fontweight='bold'),
+                    ax.text(0.02, 0.17, '• Vertices: 0', fontsize=10),
+                    ax.text(0.02, 0.14, '• Edges: 0', fontsize=10),
+                    ax.text(0.02, 0.11, '• Type: Undirected', fontsize=10),
+                    ax.text(0.02, 0.08, '• Connected: N/A', fontsize=10),
+                ]
+                blit_graph_frame(artists)
                 return
             
-            # Calculate better node positions using force-directed layout
-            if len(nodes) == 1:
-                # Single node at center
-                for node in nodes:
-                    nodes[node] = (0.5, 0.5)
-            elif len(nodes) <= 6:
-                # Arrange in circle for small graphs
-                for i, node in enumerate(nodes.keys()):
-                    angle = i * (2 * math.pi / len(nodes))
-                    x = 0.5 + 0.25 * math.cos(angle)
-                    y = 0.5 + 0.25 * math.sin(angle)
-                    nodes[node] = (x, y)
-            else:
-                # Grid layout for larger graphs
-                grid_size = math.ceil(math.sqrt(len(nodes)))
-                for i, node in enumerate(nodes.keys()):
-                    row = i // grid_size
-                    col = i % grid_size
-                    x = 0.2 + (col * 0.6 / (grid_size - 1)) if grid_size > 1 else 0.5
-                    y = 0.3 + (row * 0.4 / (grid_size - 1)) if grid_size > 1 else 0.5
-                    nodes[node] = (x, y)
-            
-            # Draw edges with weights and direction indicators
-            total_edges = 0
-            for node1 in adjacency:
-                for node2 in adjacency[node1]:
-                    if node1 in nodes and node2 in nodes:
-                        x1, y1 = nodes[node1]
-                        x2, y2 = nodes[node2]
-                        
-                        # Edge color based on whether it's being traversed
-                        edge_color = 'red' if (visited_nodes and node1 in visited_nodes and 
-                                             node2 in visited_nodes) else 'darkblue'
-                        edge_width = 3 if edge_color == 'red' else 2
-                        
-                        # Draw edge line
-                        ax.plot([x1, x2], [y1, y2], color=edge_color, 
-                               linewidth=edge_width, alpha=0.8)
-                        
-                        # Draw directional arrow (for directed graphs)
-                        mid_x, mid_y = (x1 + x2) / 2, (y1 + y2) / 2
-                        dx, dy = x2 - x1, y2 - y1
-                        length = math.sqrt(dx*dx + dy*dy)
-                        if length > 0:
-                            # Normalize direction
-                            dx_norm, dy_norm = dx/length, dy/length
-                            arrow_x = mid_x + 0.01 * dx_norm
-                            arrow_y = mid_y + 0.01 * dy_norm
-                            
-                            ax.annotate('', xy=(arrow_x, arrow_y),
-                                      xytext=(mid_x, mid_y),
-                                      arrowprops=dict(arrowstyle='->', 
-                                                    lw=2, color=edge_color))
-                        
-                        # Show edge weight if available
-                        edge_key = f"{node1}-{node2}"
-                        if edge_key in edge_weights:
-                            weight = edge_weights[edge_key]
-                            ax.text(mid_x, mid_y + 0.02, str(weight), 
-                                   ha='center', va='bottom', fontsize=9, 
-                                   bbox=dict(boxstyle="round,pad=0.2", 
-                                           facecolor="white", alpha=0.8))
-                        
-                        total_edges += 1
+            # Draw edges, as one collection that keeps the line zorder the
+            # per-edge plots had, with their direction arrows and weights
+            traversed = [bool(visited_nodes and node1 in visited_nodes and node2 in visited_nodes)
+                         for node1, node2 in edges]
+            # Edge color based on whether it's being traversed
+            edge_colors = ['red' if hit else 'darkblue' for hit in traversed]
+            if edges:
+                artists.append(ax.add_collection(LineCollection(
+                    edge_segments, colors=edge_colors, linewidths=[3 if hit else 2 for hit in traversed],
+                    alpha=0.8, zorder=2)))
+            
+            for (node1, node2), edge_color, (mid_x, mid_y), (arrow_x, arrow_y) in zip(
+                    edges, edge_colors, edge_mids.tolist(), edge_tips.tolist()):
+                # Draw directional arrow (for directed graphs)
+                if not math.isnan(arrow_x):
+                    artists.append(ax.annotate('', xy=(arrow_x, arrow_y),
+                                               xytext=(mid_x, mid_y),
+                                               arrowprops=dict(arrowstyle='->', 
+                                                             lw=2, color=edge_color)))
+                
+                # Show edge weight if available
+                edge_key = f"{node1}-{node2}"
+                if edge_key in edge_weights:
+                    weight = edge_weights[edge_key]
+                    artists.append(ax.text(mid_x, mid_y + 0.02, str(weight), 
+                                           ha='center', va='bottom', fontsize=9, 
+                                           bbox=dict(boxstyle="round,pad=0.2", 
+                                                   facecolor="white", alpha=0.8)))
+            total_edges = len(edges)
             
             # Draw nodes with enhanced styling
-            for node, (x, y) in nodes.items():
+            node_colors = []
+            for node in nodes:
                 # Node color based on state
                 if visited_nodes and node in visited_nodes:
                     if len(visited_order) > 0 and node == visited_order[-1]:
@@ -1467,30 +1866,32 @@ class UniversalAnimationEngine:
                 elif highlight_node == node:
                     color = 'orange'  # About to visit
                 else:
-                    color = hash_string_to_color(str(node))
-                
-                # Draw node circle with border
-                circle = Circle((x, y), 0.035, facecolor=color, 
-                              edgecolor='darkblue', linewidth=3)
-                ax.add_patch(circle)
-                
+                    color = _vertex_color(str(node))
+                node_colors.append(color)
+            
+            # Draw the node circles with their borders as one collection
+            artists.append(ax.add_collection(PatchCollection(
+                [Circle(position, 0.035) for position in nodes.values()],
+                facecolors=node_colors, edgecolors='darkblue', linewidths=3)))
+            
+            for node, (x, y) in nodes.items():
                 # Node label
-                ax.text(x, y, str(node), ha='center', va='center', 
-                       fontsize=11, fontweight='bold', color='darkblue')
+                artists.append(ax.text(x, y, str(node), ha='center', va='center', 
+                                       fontsize=11, fontweight='bold', color='darkblue'))
                 
                 # Node degree (number of connections)
                 degree = len(adjacency.get(node, []))
-                ax.text(x, y - 0.06, f'deg:{degree}', ha='center', va='center', 
-                       fontsize=8, style='italic', color='gray')
+                artists.append(ax.text(x, y - 0.06, f'deg:{degree}', ha='center', va='center', 
+                                       fontsize=8, style='italic', color='gray'))
             
             # Show traversal path
             if len(visited_order) > 1:
                 path_text = " → ".join(str(n) for n in visited_order[-8:])  # Last 8 nodes
                 if len(visited_order) > 8:
                     path_text = "..." + path_text
-                ax.text(0.5, 0.05, f'Traversal Path: {path_text}', 
-                       ha='center', va='center', fontsize=10,
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightyellow"))
+                artists.append(ax.text(0.5, 0.05, f'Traversal Path: {path_text}', 
+                                       ha='center', va='center', fontsize=10,
+                                       bbox=_YELLOW_BOX))
             
             # Show current operation
             if operation:
@@ -1502,75 +1903,58 @@ class UniversalAnimationEngine:
                 if 'weight' in operation:
                     op_text += f" [weight: {operation['weight']}]"
                 
-                ax.text(0.5, 0.88, op_text, ha='center', va='center', fontsize=16, 
-                       fontweight='bold', bbox=dict(boxstyle="round,pad=0.5", 
-                       facecolor="lightcyan", edgecolor="darkblue"))
+                artists.append(ax.text(0.5, 0.88, op_text, ha='center', va='center', fontsize=16, 
+                                       fontweight='bold', bbox=dict(boxstyle="round,pad=0.5", 
+                                       facecolor="lightcyan", edgecolor="darkblue")))
             
             # Show step information
             if step_info:
-                ax.text(0.98, 0.88, step_info, ha='right', va='top', fontsize=10,
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgreen"))
+                artists.append(ax.text(0.98, 0.88, step_info, ha='right', va='top', fontsize=10,
+                                       bbox=_GREEN_BOX))
             
             # Show graph properties
-            ax.text(0.02, 0.25, 'Graph Properties:', fontsize=12, fontweight='bold')
-            ax.text(0.02, 0.22, f'• Vertices: {len(nodes)}', fontsize=10)
-            ax.text(0.02, 0.19, f'• Edges: {total_edges}', fontsize=10)
-            ax.text(0.02, 0.16, f'• Type: Directed', fontsize=10)
+            artists += [
+                ax.text(0.02, 0.25, 'Graph Properties:', fontsize=12, fontweight='bold'),
+                ax.text(0.02, 0.22, f'• Vertices: {len(nodes)}', fontsize=10),
+                ax.text(0.02, 0.19, f'• Edges: {total_edges}', fontsize=10),
+                ax.text(0.02, 0.16, f'• Type: Directed', fontsize=10),
+            ]
             
-            # Check if graph is connected (simplified)
-            is_connected = len(nodes) <= 1 or len(adjacency) == len(nodes)
-            ax.text(0.02, 0.13, f'• Connected: {"Yes" if is_connected else "Unknown"}', fontsize=10)
+            artists.append(ax.text(0.02, 0.13, f'• Connected: {"Yes" if is_connected else "Unknown"}', fontsize=10))
             
             # Show adjacency list (partial)
-            adj_text = "Adjacency List:"
-            shown_nodes = 0
-            for node in sorted(adjacency.keys()):
-                if shown_nodes >= 4:  # Limit display
-                    adj_text += "\n  ..."
-                    break
-                neighbors = sorted(adjacency[node])
-                adj_text += f"\n  {node}: {neighbors}"
-                shown_nodes += 1
-            
             if adjacency:
-                ax.text(0.98, 0.25, adj_text, ha='right', va='top', fontsize=9,
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor="lightgray"))
+                artists.append(ax.text(0.98, 0.25, adj_text, ha='right', va='top', fontsize=9,
+                                       bbox=_GRAY_BOX))
+            
+            blit_graph_frame(artists)
+        
+        def blit_graph_frame(artists):
+            video.blit_frame(artists)
+            for artist in artists:
+                artist.remove()
         
         # Generate animation frames
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        video.save_background()
         
         # Initial frame - empty graph
         draw_graph_frame(step_info="Starting with empty graph")
-        plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-        frame_count += 1
         
         # Hold initial frame
-        for _ in range(30):  # 1 second
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+        video.hold_frame(30)  # 1 second
         
-        for i, operation in enumerate(operations):
-            # Show operation about to happen
-            step_info = f"Step {i+1}: {operation['type'].replace('graph_', '').title()}"
-            
-            draw_graph_frame(operation, step_info=step_info)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
-            
-            # Hold before operation
-            for _ in range(45):  # 1.5 seconds
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                frame_count += 1
-            
-            # Execute operation
+        for operation in operations:
+            # Execute operation, then show its result under the operation
             if operation['type'] == 'graph_add_node':
                 node = operation['node']
                 nodes[node] = (0.5, 0.5)  # Initial position, will be recalculated
                 if node not in adjacency:
                     adjacency[node] = []
+                layout_graph()
                 
                 step_info = f"✓ Added vertex {node}"
-                draw_graph_frame(highlight_node=node, step_info=step_info)
+                draw_graph_frame(operation, highlight_node=node, step_info=step_info)
                 
             elif operation['type'] == 'graph_add_edge':
                 from_node = operation['from_node']
@@ -1590,230 +1974,259 @@ class UniversalAnimationEngine:
                 
                 edge_key = f"{from_node}-{to_node}"
                 edge_weights[edge_key] = weight
+                layout_graph()
                 
                 step_info = f"✓ Added edge {from_node} → {to_node}"
                 if weight != 1:
                     step_info += f" (weight: {weight})"
-                draw_graph_frame(step_info=step_info)
+                draw_graph_frame(operation, step_info=step_info)
                 
             elif operation['type'] in ['graph_dfs', 'graph_bfs']:
                 start_node = operation.get('node', list(nodes.keys())[0] if nodes else None)
-                if start_node and start_node not in visited_order:
+                if start_node and start_node not in visited_set:
                     visited_order.append(start_node)
+                    visited_set.add(start_node)
                     
                     # Simulate visiting connected nodes
                     if start_node in adjacency:
                         for neighbor in adjacency[start_node][:2]:  # Visit up to 2 neighbors
-                            if neighbor not in visited_order:
+                            if neighbor not in visited_set:
                                 visited_order.append(neighbor)
+                                visited_set.add(neighbor)
                 
                 step_info = f"✓ {operation['type'].replace('graph_', '').upper()} from {start_node}"
-                draw_graph_frame(highlight_node=start_node, 
-                               visited_nodes=set(visited_order), step_info=step_info)
+                draw_graph_frame(operation, highlight_node=start_node, 
+                               visited_nodes=visited_set, step_info=step_info)
             else:
-                draw_graph_frame()
-                
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+                draw_graph_frame(operation)
             
             # Hold after operation
-            for _ in range(60):  # 2 seconds
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                frame_count += 1
+            video.hold_frame(105)  # 3.5 seconds
         
         # Final frame
         draw_graph_frame(step_info="Graph Network Complete!")
-        for _ in range(90):  # 3 seconds final view
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+        video.hold_frame(89)  # 3 seconds final view
         
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _animate_hash_table(self, operations: List[Dict], output_path: str) -> str:
         """Animate hash table operations with enhanced bucket visualization"""
-        fig, ax = plt.subplots(figsize=(14, 8))
+        fig, ax = _animation_figure((14, 8), margins=(0, 0, 1, 1))
         
         # Hash table with chaining for collision resolution
         table_size = 7
         hash_table = [[] for _ in range(table_size)]  # Each slot is a list (chain)
+        bucket_keys = [set() for _ in range(table_size)]  # Each chain's keys, for lookups
+        total_elements = 0
         collision_count = 0
         
+        @lru_cache(maxsize=256)
         def hash_function(key):
             """Enhanced hash function with visualization"""
             return hash(str(key)) % table_size
         
-        def draw_hash_table_frame(operation=None, highlight_index=None, step_info=""):
-            ax.clear()
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            
-            # Title
-            ax.text(0.5, 0.95, 'HASH TABLE VISUALIZATION', ha='center', va='center', 
-                   fontsize=18, fontweight='bold', color='darkmagenta')
-            
-            # Draw hash table structure - CENTERED LAYOUT
-            table_start_y = 0.72
-            cell_height = 0.08
-            cell_width = 0.18
-            # Center the table horizontally
-            total_table_width = 0.08 + cell_width  # index column + bucket column
-            table_x = 0.5 - (total_table_width / 2) + 0.08  # Center and offset for index column
-            
-            # Hash table properties display
-            total_elements = sum(len(chain) for chain in hash_table)
-            load_factor = total_elements / table_size
-            
-            # Draw table header - CENTERED
-            header_y = table_start_y + 0.06
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
+        
+        # Title
+        ax.text(0.5, 0.95, 'HASH TABLE VISUALIZATION', ha='center', va='center', 
+               fontsize=18, fontweight='bold', color='darkmagenta')
+        
+        # Draw hash table structure - CENTERED LAYOUT
+        table_start_y = 0.72
+        cell_height = 0.08
+        cell_width = 0.18
+        # Center the table horizontally
+        total_table_width = 0.08 + cell_width  # index column + bucket column
+        table_x = 0.5 - (total_table_width / 2) + 0.08  # Center and offset for index column
+        
+        # Draw table header - CENTERED. The headers overlap the first row, so
+        # they are redrawn over it every frame rather than kept in the background
+        header_y = table_start_y + 0.06
+        headers = [
             ax.text(table_x - 0.04, header_y, 'INDEX', ha='center', va='center', 
                    fontsize=14, fontweight='bold', color='darkblue',
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor="lightcyan"))
+                   bbox=_CYAN_BOX, animated=True),
             ax.text(table_x + cell_width/2, header_y, 'HASH BUCKET (CHAIN)', ha='center', va='center', 
                    fontsize=14, fontweight='bold', color='darkblue',
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor="lightcyan"))
-            
-            # Draw each hash table slot with chaining - CENTERED
-            for i in range(table_size):
-                y_pos = table_start_y - (i * (cell_height + 0.015))
-                
-                # Index column - better spacing
-                index_color = 'gold' if highlight_index == i else 'lightgray'
-                rect_idx = Rectangle((table_x - 0.08, y_pos), 0.06, cell_height,
-                                   facecolor=index_color, edgecolor='darkblue', linewidth=2)
-                ax.add_patch(rect_idx)
-                ax.text(table_x - 0.05, y_pos + cell_height/2, str(i),
-                       ha='center', va='center', fontsize=14, fontweight='bold', color='darkblue')
-                
-                # Hash value indicator (hash bucket) - wider for better visibility
-                bucket_color = 'yellow' if highlight_index == i else ('lightgreen' if hash_table[i] else 'white')
-                rect_bucket = Rectangle((table_x, y_pos), cell_width, cell_height,
-                                      facecolor=bucket_color, edgecolor='darkblue', linewidth=2)
-                ax.add_patch(rect_bucket)
-                
+                   bbox=_CYAN_BOX, animated=True),
+        ]
+        
+        # Animated artists for each hash table slot, updated in place each frame;
+        # the index and bucket cells of all rows share one collection whose
+        # colors are set each frame
+        cells, rows = [], []
+        for i in range(table_size):
+            y_pos = table_start_y - (i * (cell_height + 0.015))
+            
+            # Index column - better spacing
+            cells.append(Rectangle((table_x - 0.08, y_pos), 0.06, cell_height))
+            idx_label = ax.text(table_x - 0.05, y_pos + cell_height/2, str(i),
+                              ha='center', va='center', fontsize=14, fontweight='bold', color='darkblue',
+                              animated=True)
+            
+            # Hash value indicator (hash bucket) - wider for better visibility
+            cells.append(Rectangle((table_x, y_pos), cell_width, cell_height))
+            
+            # Chain elements, or NULL for an empty bucket
+            chain_label = ax.text(table_x + cell_width/2, y_pos + cell_height/2, '',
+                                ha='center', va='center', fontsize=11, animated=True)
+            
+            # Collision indicator if chain has multiple elements
+            collision_label = ax.text(table_x + cell_width + 0.02, y_pos + cell_height/2, '',
+                                    ha='left', va='center', fontsize=10, color='red', fontweight='bold',
+                                    animated=True)
+            
+            # Hash calculation for highlighted index - repositioned
+            calc_label = ax.text(table_x + cell_width + 0.08, y_pos + cell_height/2, '',
+                               ha='left', va='center', fontsize=10,
+                               bbox=dict(boxstyle="round,pad=0.2", facecolor="lightyellow"), animated=True)
+            rows.append((idx_label, chain_label, collision_label, calc_label))
+        table_cells = ax.add_collection(PatchCollection(cells, edgecolor='darkblue', linewidth=2, animated=True))
+        
+        # Show hash function details - LEFT SIDE
+        ax.text(0.02, 0.40, 'Hash Function:', fontsize=12, fontweight='bold', color='darkred')
+        ax.text(0.02, 0.37, 'h(key) = key % 7', fontsize=11, 
+               bbox=_CYAN_BOX)
+        ax.text(0.02, 0.33, 'Collision Resolution:', fontsize=12, fontweight='bold', color='darkred')
+        ax.text(0.02, 0.30, 'Separate Chaining', fontsize=11,
+               bbox=_CYAN_BOX)
+        
+        # Show statistics - LEFT SIDE LOWER
+        ax.text(0.02, 0.25, 'Hash Table Statistics:', fontsize=12, fontweight='bold', color='darkgreen')
+        ax.text(0.02, 0.22, f'• Size: {table_size} buckets', fontsize=10)
+        elements_label = ax.text(0.02, 0.19, '', fontsize=10, animated=True)
+        load_label = ax.text(0.02, 0.16, '', fontsize=10, animated=True)
+        collisions_label = ax.text(0.02, 0.13, '', fontsize=10, animated=True)
+        
+        # Performance indicators - LEFT SIDE BOTTOM
+        avg_chain_label = ax.text(0.02, 0.08, '', fontsize=10, animated=True)
+        max_chain_label = ax.text(0.02, 0.05, '', fontsize=10, animated=True)
+        
+        op_label = ax.text(0.5, 0.88, '', ha='center', va='center', fontsize=16, 
+                         fontweight='bold', bbox=dict(boxstyle="round,pad=0.5", 
+                         facecolor="lightcyan", edgecolor="darkblue"), animated=True)
+        
+        # Step information - RIGHT SIDE TOP
+        step_label = ax.text(0.98, 0.85, '', ha='right', va='top', fontsize=11,
+                           bbox=dict(boxstyle="round,pad=0.4", facecolor="lightgreen", alpha=0.8),
+                           animated=True)
+        
+        # Hash function calculation demo - RIGHT SIDE MIDDLE
+        demo_label = ax.text(0.98, 0.45, '', ha='right', va='top', fontsize=10,
+                           bbox=dict(boxstyle="round,pad=0.4", facecolor="lightyellow", alpha=0.9),
+                           animated=True)
+        
+        # Efficiency indicator - RIGHT SIDE BOTTOM
+        efficiency_colors = {"Excellent": "lightgreen", "Good": "lightblue", "Fair": "lightyellow", "Poor": "lightcoral"}
+        efficiency_label = ax.text(0.98, 0.20, '', ha='right', va='center', fontsize=12,
+                                 fontweight='bold', bbox=dict(boxstyle="round,pad=0.4"), animated=True)
+        
+        # Hash table legend - RIGHT SIDE
+        ax.text(0.98, 0.12, 'Legend:', ha='right', va='top', fontsize=10, fontweight='bold')
+        ax.text(0.98, 0.09, '● Active Bucket (Yellow)', ha='right', va='top', fontsize=9)
+        ax.text(0.98, 0.06, '● Occupied Bucket (Green)', ha='right', va='top', fontsize=9)
+        ax.text(0.98, 0.03, '○ Empty Bucket (White)', ha='right', va='top', fontsize=9)
+        
+        def update_table():
+            """Refresh the chain, statistics and performance labels after the table changes"""
+            for chain, (_, chain_label, collision_label, _) in zip(hash_table, rows):
                 # Draw chain elements with better formatting
-                if hash_table[i]:
+                if chain:
                     # Show chained elements
-                    chain_text = " → ".join(str(elem) for elem in hash_table[i])
+                    chain_text = " → ".join(str(elem) for elem in chain)
                     if len(chain_text) > 20:  # Adjust for wider cells
                         chain_text = chain_text[:17] + "..."
-                    
-                    ax.text(table_x + cell_width/2, y_pos + cell_height/2, chain_text,
-                           ha='center', va='center', fontsize=11, fontweight='bold', color='darkgreen')
-                    
-                    # Show collision indicator if chain has multiple elements
-                    if len(hash_table[i]) > 1:
-                        ax.text(table_x + cell_width + 0.02, y_pos + cell_height/2, 
-                               f'[{len(hash_table[i])} items]', ha='left', va='center', 
-                               fontsize=10, color='red', fontweight='bold')
+                    chain_label.set_text(chain_text)
+                    chain_label.set_fontweight('bold')
+                    chain_label.set_fontstyle('normal')
+                    chain_label.set_color('darkgreen')
                 else:
-                    ax.text(table_x + cell_width/2, y_pos + cell_height/2, 'NULL',
-                           ha='center', va='center', fontsize=11, style='italic', color='gray')
+                    chain_label.set_text('NULL')
+                    chain_label.set_fontweight('normal')
+                    chain_label.set_fontstyle('italic')
+                    chain_label.set_color('gray')
                 
-                # Show hash calculation for highlighted index - repositioned
-                if operation and 'key' in operation and highlight_index == i:
-                    key = operation['key']
-                    hash_val = hash_function(key)
-                    ax.text(table_x + cell_width + 0.08, y_pos + cell_height/2, 
-                           f'hash({key}) = {hash_val}', ha='left', va='center', 
-                           fontsize=10, bbox=dict(boxstyle="round,pad=0.2", facecolor="lightyellow"))
-            
-            # Show hash function details - LEFT SIDE
-            ax.text(0.02, 0.40, 'Hash Function:', fontsize=12, fontweight='bold', color='darkred')
-            ax.text(0.02, 0.37, 'h(key) = key % 7', fontsize=11, 
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor="lightcyan"))
-            ax.text(0.02, 0.33, 'Collision Resolution:', fontsize=12, fontweight='bold', color='darkred')
-            ax.text(0.02, 0.30, 'Separate Chaining', fontsize=11,
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor="lightcyan"))
-            
-            # Show statistics - LEFT SIDE LOWER
-            ax.text(0.02, 0.25, 'Hash Table Statistics:', fontsize=12, fontweight='bold', color='darkgreen')
-            ax.text(0.02, 0.22, f'• Size: {table_size} buckets', fontsize=10)
-            ax.text(0.02, 0.19, f'• Elements: {total_elements}', fontsize=10)
-            ax.text(0.02, 0.16, f'• Load Factor: {load_factor:.2f}', fontsize=10)
-            ax.text(0.02, 0.13, f'• Collisions: {collision_count}', fontsize=10)
-            
-            # Performance indicators - LEFT SIDE BOTTOM
+                collision_label.set_visible(len(chain) > 1)
+                collision_label.set_text(f'[{len(chain)} items]')
+            
+            load_factor = total_elements / table_size
+            
+            # Show statistics
+            elements_label.set_text(f'• Elements: {total_elements}')
+            load_label.set_text(f'• Load Factor: {load_factor:.2f}')
+            collisions_label.set_text(f'• Collisions: {collision_count}')
+            
+            # Performance indicators
             avg_chain_length = total_elements / table_size if table_size > 0 else 0
             max_chain_length = max(len(chain) for chain in hash_table) if hash_table else 0
             
-            ax.text(0.02, 0.08, f'• Avg Chain Length: {avg_chain_length:.1f}', fontsize=10)
-            ax.text(0.02, 0.05, f'• Max Chain Length: {max_chain_length}', fontsize=10)
+            avg_chain_label.set_text(f'• Avg Chain Length: {avg_chain_length:.1f}')
+            max_chain_label.set_text(f'• Max Chain Length: {max_chain_length}')
+            
+            # Efficiency indicator
+            efficiency = "Excellent" if load_factor < 0.5 else "Good" if load_factor < 0.75 else "Fair" if load_factor < 1.0 else "Poor"
+            efficiency_label.set_text(f'Performance: {efficiency}')
+            efficiency_label.get_bbox_patch().set_facecolor(efficiency_colors.get(efficiency, "lightgray"))
+        
+        def draw_hash_table_frame(operation=None, highlight_index=None, step_info=""):
+            # Draw each hash table slot with chaining
+            cell_colors = []
+            for i, (idx_label, chain_label, collision_label, calc_label) in enumerate(rows):
+                cell_colors.append('gold' if highlight_index == i else 'lightgray')
+                cell_colors.append('yellow' if highlight_index == i else ('lightgreen' if hash_table[i] else 'white'))
+                
+                calc_label.set_visible(bool(operation and 'key' in operation and highlight_index == i))
+                if calc_label.get_visible():
+                    key = operation['key']
+                    calc_label.set_text(f'hash({key}) = {hash_function(key)}')
             
             # Show current operation
+            op_label.set_visible(operation is not None)
             if operation:
                 op_text = f"Operation: {operation['type'].replace('hash_', '').upper()}"
                 if 'key' in operation:
                     key = operation['key']
                     index = hash_function(key)
                     op_text += f" (key: {key}, hash: {index})"
-                
-                ax.text(0.5, 0.88, op_text, ha='center', va='center', fontsize=16, 
-                       fontweight='bold', bbox=dict(boxstyle="round,pad=0.5", 
-                       facecolor="lightcyan", edgecolor="darkblue"))
+                op_label.set_text(op_text)
             
-            # Show step information - RIGHT SIDE TOP
-            if step_info:
-                ax.text(0.98, 0.85, step_info, ha='right', va='top', fontsize=11,
-                       bbox=dict(boxstyle="round,pad=0.4", facecolor="lightgreen", alpha=0.8))
+            # Show step information
+            step_label.set_visible(bool(step_info))
+            step_label.set_text(step_info)
             
-            # Draw hash function calculation demo - RIGHT SIDE MIDDLE
-            if operation and 'key' in operation:
+            # Draw hash function calculation demo
+            demo_label.set_visible(bool(operation and 'key' in operation))
+            if demo_label.get_visible():
                 key = operation['key']
                 hash_val = hash_function(key)
                 
                 demo_text = f"Hash Calculation Demo:\n"
                 demo_text += f"hash({key}) = {key} % {table_size} = {hash_val}\n"
                 demo_text += f"→ Insert at bucket [{hash_val}]"
-                
-                ax.text(0.98, 0.45, demo_text, ha='right', va='top', fontsize=10,
-                       bbox=dict(boxstyle="round,pad=0.4", facecolor="lightyellow", alpha=0.9))
-            
-            # Efficiency indicator - RIGHT SIDE BOTTOM
-            efficiency = "Excellent" if load_factor < 0.5 else "Good" if load_factor < 0.75 else "Fair" if load_factor < 1.0 else "Poor"
-            efficiency_colors = {"Excellent": "lightgreen", "Good": "lightblue", "Fair": "lightyellow", "Poor": "lightcoral"}
-            efficiency_color = efficiency_colors.get(efficiency, "lightgray")
+                demo_label.set_text(demo_text)
             
-            ax.text(0.98, 0.20, f'Performance: {efficiency}', ha='right', va='center', fontsize=12,
-                   fontweight='bold', bbox=dict(boxstyle="round,pad=0.4", facecolor=efficiency_color))
+            table_cells.set_facecolor(cell_colors)
             
-            # Hash table legend - RIGHT SIDE
-            ax.text(0.98, 0.12, 'Legend:', ha='right', va='top', fontsize=10, fontweight='bold')
-            ax.text(0.98, 0.09, '● Active Bucket (Yellow)', ha='right', va='top', fontsize=9)
-            ax.text(0.98, 0.06, '● Occupied Bucket (Green)', ha='right', va='top', fontsize=9)
-            ax.text(0.98, 0.03, '○ Empty Bucket (White)', ha='right', va='top', fontsize=9)
+            video.blit_frame(headers + [table_cells] + [artist for row in rows for artist in row]
+                             + [elements_label, load_label, collisions_label, avg_chain_label, max_chain_label,
+                                op_label, step_label, demo_label, efficiency_label])
         
         # Generate animation frames
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        video.save_background()
         
         # Initial frame - empty hash table
+        update_table()
         draw_hash_table_frame(step_info="Starting with empty hash table")
-        plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-        frame_count += 1
         
         # Hold initial frame
-        for _ in range(30):  # 1 second
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+        video.hold_frame(30)  # 1 second
         
-        for i, operation in enumerate(operations):
-            # Show operation about to happen
-            step_info = f"Step {i+1}: {operation['type'].replace('hash_', '').title()}"
-            if 'key' in operation:
-                step_info += f" key {operation['key']}"
-            
-            draw_hash_table_frame(operation, step_info=step_info)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
-            
-            # Hold before operation
-            for _ in range(45):  # 1.5 seconds
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                frame_count += 1
-            
-            # Execute operation
+        for operation in operations:
+            # Execute operation, then show its result under the operation
             if operation['type'] == 'hash_insert':
                 key = operation['key']
                 index = hash_function(key)
@@ -1823,8 +2236,11 @@ class UniversalAnimationEngine:
                     collision_count += 1
                 
                 # Insert into chain
-                if key not in hash_table[index]:  # Avoid duplicates
+                if key not in bucket_keys[index]:  # Avoid duplicates
                     hash_table[index].append(key)
+                    bucket_keys[index].add(key)
+                    total_elements += 1
+                update_table()
                 
                 # Show result with highlighted index
                 step_info = f"✓ Inserted {key} at index {index}"
@@ -1838,7 +2254,7 @@ class UniversalAnimationEngine:
                 index = hash_function(key)
                 
                 # Search in chain
-                found = key in hash_table[index]
+                found = key in bucket_keys[index]
                 
                 step_info = f"✓ Search for {key}: {'Found' if found else 'Not found'} at index {index}"
                 draw_hash_table_frame(operation, index, step_info)
@@ -1848,32 +2264,27 @@ class UniversalAnimationEngine:
                 index = hash_function(key)
                 
                 # Remove from chain if exists
-                if key in hash_table[index]:
+                if key in bucket_keys[index]:
                     hash_table[index].remove(key)
+                    bucket_keys[index].discard(key)
+                    total_elements -= 1
+                    update_table()
                     step_info = f"✓ Deleted {key} from index {index}"
                 else:
                     step_info = f"✗ {key} not found for deletion"
                 
                 draw_hash_table_frame(operation, index, step_info)
             else:
-                draw_hash_table_frame()
-                
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+                draw_hash_table_frame(operation)
             
             # Hold after operation
-            for _ in range(60):  # 2 seconds
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-                frame_count += 1
+            video.hold_frame(105)  # 3.5 seconds
         
         # Final frame
         draw_hash_table_frame(step_info="Hash Table Complete!")
-        for _ in range(90):  # 3 seconds final view
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=120, bbox_inches='tight')
-            frame_count += 1
+        video.hold_frame(89)  # 3 seconds final view
         
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
     
     def _create_algorithm_animation(self, elements: List[Dict], output_path: str) -> str:
@@ -1882,66 +2293,53 @@ class UniversalAnimationEngine:
             return self._create_general_animation([{'type': 'text_slide', 'content': 'Algorithm Visualization'}], output_path)
         
         # Simple sorting animation
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig, ax = _animation_figure((12, 8))
         
         # Get array to sort
         array = elements[0].get('array', ['64', '34', '25', '12', '22', '11', '90'])
         array = [int(x) for x in array if x.isdigit()]
         
+        # Sorting only reorders the values, so the limits are fixed
+        ax.set_xlim(-0.5, len(array) - 0.5)
+        ax.set_ylim(0, max(array) + 10)
+        ax.set_title('BUBBLE SORT VISUALIZATION', fontsize=20, fontweight='bold')
+        
+        # One animated bar and value label per position, updated in place
+        # each frame; the bottom spine is redrawn over the bars it overlaps
+        bars = ax.bar(range(len(array)), array, color='lightblue', edgecolor='black', linewidth=2,
+                      animated=True)
+        labels = [ax.text(i, 0, '', ha='center', va='bottom', fontsize=12, fontweight='bold', animated=True)
+                  for i in range(len(array))]
+        sorted_label = ax.text(len(array)/2, max(array) + 5, 'SORTED!', ha='center', va='center', 
+                               fontsize=24, fontweight='bold', color='green', animated=True)
+        sorted_label.set_visible(False)
+        
         def draw_sorting_frame(arr, comparing=None, swapping=None):
-            ax.clear()
-            ax.set_xlim(-0.5, len(arr) - 0.5)
-            ax.set_ylim(0, max(arr) + 10)
-            ax.set_title('BUBBLE SORT VISUALIZATION', fontsize=20, fontweight='bold')
-            
             # Draw bars
-            for i, val in enumerate(arr):
+            for i, (bar, label, val) in enumerate(zip(bars, labels, arr)):
                 color = 'red' if i in (comparing or []) else 'blue' if i in (swapping or []) else 'lightblue'
-                ax.bar(i, val, color=color, edgecolor='black', linewidth=2)
-                ax.text(i, val + 1, str(val), ha='center', va='bottom', fontsize=12, fontweight='bold')
+                bar.set_height(val)
+                bar.set_facecolor(color)
+                label.set_y(val + 1)
+                label.set_text(str(val))
+            
+            video.blit_frame([*bars, *labels, sorted_label, ax.spines['bottom']])
         
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        video.save_background()
         
-        # Bubble sort animation
-        arr = array[:]
-        n = len(arr)
-        
-        for i in range(n):
-            for j in range(0, n - i - 1):
-                # Show comparison
-                draw_sorting_frame(arr, comparing=[j, j + 1])
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                frame_count += 1
-                
-                if arr[j] > arr[j + 1]:
-                    # Show swap
-                    draw_sorting_frame(arr, swapping=[j, j + 1])
-                    plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                    frame_count += 1
-                    
-                    # Perform swap
-                    arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                    
-                    # Show result
-                    draw_sorting_frame(arr)
-                    plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                    frame_count += 1
-                
-                # Hold frame
-                for _ in range(30):
-                    plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                    frame_count += 1
+        # Bubble sort animation, rendered straight through from its trace
+        arr = array
+        for arr, comparing, swapping, hold in _bubble_sort_trace(array):
+            draw_sorting_frame(arr, comparing, swapping)
+            video.hold_frame(hold)
         
         # Final sorted array
+        sorted_label.set_visible(True)
         draw_sorting_frame(arr)
-        ax.text(len(arr)/2, max(arr) + 5, 'SORTED!', ha='center', va='center', 
-               fontsize=24, fontweight='bold', color='green')
-        for _ in range(90):  # Hold final frame
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
-        
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.hold_frame(89)  # Hold final frame
+        
+        video.close()
         return output_path
     
     def _create_math_animation(self, elements: List[Dict], output_path: str) -> str:
@@ -1955,46 +2353,7 @@ class UniversalAnimationEngine:
             pass
         
         # Fallback to original math animation
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        def draw_math_frame(step):
-            ax.clear()
-            ax.set_xlim(-10, 10)
-            ax.set_ylim(-10, 10)
-            ax.grid(True, alpha=0.3)
-            ax.set_title('MATHEMATICAL VISUALIZATION', fontsize=20, fontweight='bold')
-            
-            # Draw coordinate system
-            ax.axhline(y=0, color='k', linewidth=0.5)
-            ax.axvline(x=0, color='k', linewidth=0.5)
-            
-            # Draw a simple function (e.g., y = x^2)
-            x = np.linspace(-3, 3, 100)
-            y = x**2
-            ax.plot(x, y, 'b-', linewidth=3, label='y = x²')
-            
-            # Animate a point moving along the curve
-            t = step * 0.1
-            if -3 <= t <= 3:
-                point_y = t**2
-                ax.plot(t, point_y, 'ro', markersize=10)
-                ax.text(t, point_y + 1, f'({t:.1f}, {point_y:.1f})', 
-                       ha='center', va='bottom', fontsize=12, fontweight='bold')
-            
-            ax.legend()
-            ax.set_xlabel('x', fontsize=14)
-            ax.set_ylabel('y', fontsize=14)
-        
-        frame_count = 0
-        
-        for step in range(60):  # 2 seconds of animation
-            draw_math_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
-        
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
-        return output_path
+        return self._render_steps(_draw_math_frame, range(60), output_path)  # 2 seconds of animation
     
     def _create_physics_animation(self, elements: List[Dict], output_path: str) -> str:
         """Create enhanced physics animations based on actual note content"""
@@ -2007,59 +2366,7 @@ class UniversalAnimationEngine:
             pass
         
         # Fallback to original physics animation
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        def draw_physics_frame(step):
-            ax.clear()
-            ax.set_xlim(0, 10)
-            ax.set_ylim(0, 6)
-            ax.set_title('PHYSICS SIMULATION - PROJECTILE MOTION', fontsize=20, fontweight='bold')
-            
-            # Projectile motion parameters
-            v0 = 8  # initial velocity
-            angle = 45  # launch angle
-            g = 9.8  # gravity
-            t = step * 0.1
-            
-            # Calculate position
-            x = v0 * np.cos(np.radians(angle)) * t
-            y = v0 * np.sin(np.radians(angle)) * t - 0.5 * g * t**2
-            
-            if y >= 0 and x <= 10:
-                # Draw trajectory
-                t_traj = np.linspace(0, t, 50)
-                x_traj = v0 * np.cos(np.radians(angle)) * t_traj
-                y_traj = v0 * np.sin(np.radians(angle)) * t_traj - 0.5 * g * t_traj**2
-                
-                valid_indices = y_traj >= 0
-                ax.plot(x_traj[valid_indices], y_traj[valid_indices], 'b--', alpha=0.5)
-                
-                # Draw projectile
-                ax.plot(x, y, 'ro', markersize=15)
-                
-                # Add velocity vector
-                vx = v0 * np.cos(np.radians(angle))
-                vy = v0 * np.sin(np.radians(angle)) - g * t
-                ax.arrow(x, y, vx/10, vy/10, head_width=0.2, head_length=0.2, fc='red', ec='red')
-                
-                # Add text
-                ax.text(1, 5, f'Time: {t:.1f}s', fontsize=14, fontweight='bold')
-                ax.text(1, 4.5, f'Position: ({x:.1f}, {y:.1f})', fontsize=12)
-            
-            ax.set_xlabel('Distance (m)', fontsize=14)
-            ax.set_ylabel('Height (m)', fontsize=14)
-            ax.grid(True, alpha=0.3)
-        
-        frame_count = 0
-        
-        for step in range(80):
-            draw_physics_frame(step)
-            plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-            frame_count += 1
-        
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
-        return output_path
+        return self._render_steps(_draw_physics_frame, range(80), output_path)
     
     def _create_chemistry_animation(self, elements: List[Dict], output_path: str) -> str:
         """Create enhanced chemistry animations based on actual note content"""
@@ -2089,111 +2396,87 @@ class UniversalAnimationEngine:
     
     def _create_process_animation(self, elements: List[Dict], output_path: str) -> str:
         """Create business process animations"""
-        fig, ax = plt.subplots(figsize=(12, 8))
-        
-        def draw_process_frame(current_step):
-            ax.clear()
-            ax.set_xlim(0, 10)
-            ax.set_ylim(0, 8)
-            ax.set_title('BUSINESS PROCESS FLOW', fontsize=20, fontweight='bold')
-            
-            # Draw process steps as boxes
-            steps = ['Start', 'Analysis', 'Decision', 'Implementation', 'Review', 'End']
-            positions = [(1, 4), (3, 4), (5, 4), (7, 4), (5, 2), (9, 4)]
-            
-            for i, (step, pos) in enumerate(zip(steps, positions)):
-                color = 'lightgreen' if i == current_step else 'lightblue'
-                rect = Rectangle((pos[0]-0.5, pos[1]-0.3), 1, 0.6, 
-                               facecolor=color, edgecolor='black', linewidth=2)
-                ax.add_patch(rect)
-                ax.text(pos[0], pos[1], step, ha='center', va='center', 
-                       fontsize=10, fontweight='bold')
-            
-            # Draw arrows
-            arrow_paths = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (2, 4)]  # Decision branch
-            for start_idx, end_idx in arrow_paths:
-                if start_idx < len(positions) and end_idx < len(positions):
-                    start_pos = positions[start_idx]
-                    end_pos = positions[end_idx]
-                    ax.annotate('', xy=end_pos, xytext=start_pos,
-                               arrowprops=dict(arrowstyle='->', lw=2, color='blue'))
-        
-        frame_count = 0
-        
-        for step in range(6):
-            for _ in range(60):  # Hold each step for 2 seconds
-                draw_process_frame(step)
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                frame_count += 1
-        
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
-        return output_path
+        # Only 6 still frames, too few to be worth starting worker processes for
+        return self._render_steps(_draw_process_frame, range(6), output_path, hold=60,
+                                  parallel=False)  # Hold each step for 2 seconds
     
     def _create_general_animation(self, elements: List[Dict], output_path: str) -> str:
         """Create general text-based animation"""
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig, ax = _animation_figure((12, 8), margins=(0, 0, 1, 1))
+        ax.set_xlim(0, 1)
+        ax.set_ylim(0, 1)
+        ax.axis('off')
         
-        def draw_text_frame(text, step):
-            ax.clear()
-            ax.set_xlim(0, 1)
-            ax.set_ylim(0, 1)
-            ax.axis('off')
-            
-            # Animated text appearance
-            visible_chars = min(len(text), step * 2)
-            visible_text = text[:visible_chars]
-            
-            ax.text(0.5, 0.5, visible_text, ha='center', va='center', 
-                   fontsize=20, fontweight='bold', wrap=True)
+        # The axes are blank, so each frame only blits the text over them
+        label = ax.text(0.5, 0.5, '', ha='center', va='center', 
+                        fontsize=20, fontweight='bold', wrap=True, animated=True)
+        
+        def draw_text_frame(visible_text):
+            label.set_text(visible_text)
+            video.blit_frame([label])
         
-        frame_count = 0
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        video.save_background()
         
         for element in elements:
             text = element.get('content', 'Content Visualization')
             
-            # Animate text appearance
-            for step in range(len(text) // 2 + 30):
-                draw_text_frame(text, step)
-                plt.savefig(f'temp_frame_{frame_count:04d}.png', dpi=100, bbox_inches='tight')
-                frame_count += 1
+            # Animate text appearance two characters a frame, speeding up so
+            # long text is fully revealed within 5 seconds, then hold it for
+            # the rest of the min(len(text) // 2, 5 seconds) + 30 frames
+            max_steps = self.fps * 5
+            reveal_steps = min((len(text) + 1) // 2, max_steps)
+            chars_per_step = math.ceil(len(text) / max(reveal_steps, 1))
+            for step in range(reveal_steps + 1):
+                draw_text_frame(text[:step * chars_per_step])
+            video.hold_frame(min(len(text) // 2, max_steps) + 29 - reveal_steps)
+        
+        video.close()
+        return output_path
+    
+    def _render_steps(self, draw_frame, steps, output_path: str, hold: int = 1,
+                      parallel: bool = True) -> str:
+        """Render an animation whose frames depend only on their step, one frame per step.
+        
+        Each frame is shown for `hold` video frames. With `parallel` the
+        frames are drawn on a process pool, else one after another here.
+        """
+        fig, ax = _animation_figure((12, 8))
+        video = _VideoWriter(fig, output_path, self.fps, self.width, self.height)
+        
+        # Frames are independent, so spread them over a process pool when
+        # there is more than one core; each worker draws on its own figure
+        # and gets one even share of the steps, so none is started to sit idle
+        steps = list(steps)
+        workers = min(os.cpu_count() or 1, len(steps)) if parallel else 1
+        if workers > 1:
+            render = partial(_render_frame, draw_frame, tuple(fig.get_size_inches()), fig.dpi)
+            chunksize = max(1, math.ceil(len(steps) / workers))
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context()) as executor:
+                for frame in executor.map(render, steps, chunksize=chunksize):
+                    video.add_frame(frame, hold)
+        else:
+            for step in steps:
+                draw_frame(ax, step)
+                video.save_frame(hold)
         
-        plt.close()
-        self._frames_to_video(frame_count, output_path)
+        video.close()
         return output_path
+
+_DURATION_PAT = re.compile(r'Duration: (\d+):(\d+):(\d+\.\d+)')
+
+
+def media_duration(path: str) -> float:
+    """Duration of a media file in seconds, as ffmpeg reports it"""
+    import imageio_ffmpeg
     
-    def _frames_to_video(self, frame_count: int, output_path: str):
-        """Convert frame images to video using moviepy"""
-        try:
-            # Import MoviePy locally to avoid import conflicts
-            from moviepy.editor import ImageSequenceClip
-            
-            # Create list of frame files
-            frame_files = [f'temp_frame_{i:04d}.png' for i in range(frame_count)]
-            
-            # Filter only existing frames
-            existing_frames = [f for f in frame_files if os.path.exists(f)]
-            
-            if not existing_frames:
-                print("No frames found to create video")
-                return
-            
-            # Create video clip
-            clip = ImageSequenceClip(existing_frames, fps=self.fps)
-            clip.write_videofile(output_path, codec='libx264', logger=None)
-            clip.close()
-            
-            # Clean up temporary frames
-            for frame_file in existing_frames:
-                if os.path.exists(frame_file):
-                    os.remove(frame_file)
-                    
-        except Exception as e:
-            print(f"Error creating video: {e}")
-            # Fallback: copy first frame as static image
-            if os.path.exists('temp_frame_0000.png'):
-                import shutil
-                shutil.copy('temp_frame_0000.png', output_path.replace('.mp4', '.png'))
+    probe = subprocess.run([imageio_ffmpeg.get_ffmpeg_exe(), '-i', path],
+                           capture_output=True, text=True)
+    match = _DURATION_PAT.search(probe.stderr)
+    if match is None:
+        raise ValueError(f"Could not read the duration of {path}")
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
 
 
 def create_intelligent_animation(text: str, output_path: str) -> str:
@@ -2208,10 +2491,6 @@ def create_intelligent_animation(text: str, output_path: str) -> str:
     print(f"   Score: {content_analysis['score']}")
     print(f"   Elements: {len(content_analysis['elements'])}")
     
-    # Create appropriate animation
-    animator = UniversalAnimationEngine()
-    result_path = animator.create_animation(content_analysis, output_path)
-    
     # Add audio narration
     from text_to_animation_full_project import text_to_speech
     temp_audio = 'temp_narration.mp3'
@@ -2230,32 +2509,36 @@ def create_intelligent_animation(text: str, output_path: str) -> str:
     
     narration_text += text[:200] + "..."  # Add some original content
     
+    # The narration only needs the text, so it is synthesized while the
+    # animation renders; its errors surface below, as before
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        narration = executor.submit(text_to_speech, narration_text, temp_audio)
+        
+        # Create appropriate animation
+        animator = UniversalAnimationEngine()
+        result_path = animator.create_animation(content_analysis, output_path)
+    
     try:
-        # Import MoviePy locally to avoid conflicts
-        from text_to_animation_full_project import text_to_speech
-        text_to_speech(narration_text, temp_audio)
-        
-        # Combine video and audio
-        from moviepy.editor import VideoFileClip, AudioFileClip
-        
-        video_clip = VideoFileClip(result_path)
-        audio_clip = AudioFileClip(temp_audio)
+        narration.result()
         
-        # Adjust durations
-        if video_clip.duration < audio_clip.duration:
-            video_clip = video_clip.loop(duration=audio_clip.duration)
-        else:
-            audio_clip = audio_clip.subclip(0, min(audio_clip.duration, video_clip.duration))
+        # Combine video and audio in one ffmpeg pass: the video stream is
+        # copied, looped if the narration outlasts it, and only the audio
+        # is encoded
+        import imageio_ffmpeg
         
-        final_video = video_clip.set_audio(audio_clip)
+        video_duration = media_duration(result_path)
+        audio_duration = media_duration(temp_audio)
         final_output = output_path.replace('.mp4', '_with_audio.mp4')
-        final_video.write_videofile(final_output, codec='libx264', audio_codec='aac', logger=None)
         
-        # Clean up
-        video_clip.close()
-        audio_clip.close()
-        final_video.close()
+        command = [imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-loglevel', 'error']
+        if video_duration < audio_duration:
+            command += ['-stream_loop', '-1']
+        command += ['-i', result_path, '-i', temp_audio, '-map', '0:v', '-map', '1:a',
+                    '-c:v', 'copy', '-c:a', 'aac', '-t', str(max(video_duration, audio_duration)),
+                    final_output]
+        subprocess.run(command, check=True)
         
+        # Clean up
         if os.path.exists(temp_audio):
             os.remove(temp_audio)
         if os.path.exists(result_path):
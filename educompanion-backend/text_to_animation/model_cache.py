@@ -9,10 +9,14 @@ model loading.
 
 import os
 import time
+import atexit
 import pickle
+import hashlib
+import importlib.util
 import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional
-from functools import lru_cache
 import threading
 
 # NLP
@@ -26,9 +30,25 @@ class ModelCacheManager:
     """Singleton class to manage model loading and caching"""
     
     _instance = None
-    _lock = threading.Lock()
+    _lock = threading.RLock()
     _models = {}
     
+    # One lock per model key, so a model loads once however many callers ask
+    # for it while different models still load side by side
+    _load_locks: Dict[tuple, threading.Lock] = {}
+    
+    # Summaries keyed on the model, the length limits and a digest of the
+    # text, persisted under cache_dir so a restart still skips re-summarizing
+    _summaries: "OrderedDict[tuple, str]" = None
+    _summary_cache_size = 512
+    
+    # The file is rewritten at most every _summary_save_interval seconds, and
+    # once more at exit, by one writer at a time outside _lock
+    _summaries_dirty = False
+    _summaries_saved_at = 0.0
+    _summary_save_interval = 30.0
+    _save_lock = threading.Lock()
+    
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
@@ -42,92 +62,213 @@ class ModelCacheManager:
             self.logger = logging.getLogger(__name__)
             self.cache_dir = 'model_cache'
             os.makedirs(self.cache_dir, exist_ok=True)
+            atexit.register(self.save_summaries)
             self._initialized = True
     
-    @lru_cache(maxsize=3)
+    @staticmethod
+    def _key(kind: str, **kwargs) -> tuple:
+        """Hashable cache key for a model, with list arguments made tuples"""
+        return (kind,) + tuple(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in sorted(kwargs.items())
+        )
+    
+    def _load_lock(self, cache_key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._load_locks.setdefault(cache_key, threading.Lock())
+    
     def get_summarization_pipeline(self, model_name: str = 'sshleifer/distilbart-cnn-12-6'):
         """Get cached summarization pipeline"""
-        cache_key = f"summarizer_{model_name.replace('/', '_')}"
-        
-        if cache_key in self._models:
-            self.logger.info(f"Using cached summarization model: {model_name}")
-            return self._models[cache_key]
-        
-        start_time = time.time()
-        self.logger.info(f"Loading summarization model: {model_name}")
+        cache_key = self._key('summarizer', model_name=model_name)
         
-        try:
-            # Use device auto-detection for GPU if available
-            device = 0 if torch.cuda.is_available() else -1
+        # Concurrent callers wait for one load instead of each starting their own
+        with self._load_lock(cache_key):
+            if cache_key in self._models:
+                self.logger.info(f"Using cached summarization model: {model_name}")
+                return self._models[cache_key]
             
-            pipeline_obj = pipeline(
-                'summarization', 
-                model=model_name,
-                device=device,
-                model_kwargs={"torch_dtype": torch.float16 if torch.cuda.is_available() else torch.float32}
-            )
+            start_time = time.time()
+            self.logger.info(f"Loading summarization model: {model_name}")
             
-            self._models[cache_key] = pipeline_obj
-            load_time = time.time() - start_time
-            self.logger.info(f"Model loaded in {load_time:.2f} seconds")
-            
-            return pipeline_obj
+            try:
+                # Use device auto-detection for GPU if available
+                device = 0 if torch.cuda.is_available() else -1
+                
+                model_kwargs = {"torch_dtype": self._inference_dtype()}
+                # With accelerate installed the checkpoint is loaded straight
+                # into an empty (meta device) model, memory-mapping safetensors
+                # weights, instead of first building and initializing a random
+                # one; transformers refuses the flag without it
+                if importlib.util.find_spec('accelerate') is not None:
+                    model_kwargs["low_cpu_mem_usage"] = True
+                
+                pipeline_obj = pipeline(
+                    'summarization', 
+                    model=model_name,
+                    device=device,
+                    model_kwargs=model_kwargs
+                )
+                
+                if not torch.cuda.is_available():
+                    # CPU generation is bound by streaming the Linear weights;
+                    # int8 weights are a quarter of the float32 traffic
+                    try:
+                        pipeline_obj.model = torch.quantization.quantize_dynamic(
+                            pipeline_obj.model, {torch.nn.Linear}, dtype=torch.qint8)
+                    except Exception as e:
+                        self.logger.warning(f"int8 quantization unavailable, using float32 model: {e}")
+                
+                self._models[cache_key] = pipeline_obj
+                load_time = time.time() - start_time
+                self.logger.info(f"Model loaded in {load_time:.2f} seconds")
+                
+                return pipeline_obj
+                
+            except Exception as e:
+                self.logger.error(f"Failed to load model {model_name}: {e}")
+                # Fallback to smaller model
+                if model_name != 't5-small':
+                    self.logger.info("Falling back to t5-small model")
+                    # Remembered under the requested name too, so the failed
+                    # load isn't retried on every call
+                    pipeline_obj = self.get_summarization_pipeline('t5-small')
+                    self._models[cache_key] = pipeline_obj
+                    return pipeline_obj
+                raise
+    
+    @staticmethod
+    def _inference_dtype():
+        """bfloat16 where the GPU supports it, float16 on other GPUs, float32 on CPU"""
+        if not torch.cuda.is_available():
+            return torch.float32
+        if torch.cuda.is_bf16_supported():
+            return torch.bfloat16
+        return torch.float16
+    
+    def batch_summarize(self, texts, model_name: str = 'sshleifer/distilbart-cnn-12-6',
+                        batch_size: int = 8, **generate_kwargs):
+        """Summarize several texts in batched forward passes, in order"""
+        summarizer = self.get_summarization_pipeline(model_name)
+        outputs = summarizer(list(texts), batch_size=batch_size, truncation=True, **generate_kwargs)
+        return [output['summary_text'] for output in outputs]
+    
+    def _summary_cache_path(self) -> str:
+        return os.path.join(self.cache_dir, 'summaries.pkl')
+    
+    def _load_summaries(self) -> "OrderedDict[tuple, str]":
+        # Called with the lock held
+        if self._summaries is None:
+            try:
+                with open(self._summary_cache_path(), 'rb') as f:
+                    ModelCacheManager._summaries = OrderedDict(pickle.load(f))
+            except (OSError, pickle.UnpicklingError, EOFError, TypeError, ValueError):
+                ModelCacheManager._summaries = OrderedDict()
+        return self._summaries
+    
+    @staticmethod
+    def summary_key(model_name: str, text: str, max_length: int, min_length: int) -> tuple:
+        """Cache key for a summary of `text`, without holding the text itself"""
+        digest = hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        return (model_name, digest, max_length, min_length)
+    
+    def get_summary(self, key: tuple) -> Optional[str]:
+        """Get a cached summary, or None"""
+        with self._lock:
+            summaries = self._load_summaries()
+            summary = summaries.get(key)
+            if summary is not None:
+                summaries.move_to_end(key)
+        return summary
+    
+    def store_summary(self, key: tuple, summary: str):
+        """Cache a summary in memory and, every so often, on disk"""
+        with self._lock:
+            summaries = self._load_summaries()
+            summaries[key] = summary
+            if len(summaries) > self._summary_cache_size:
+                summaries.popitem(last=False)
+            ModelCacheManager._summaries_dirty = True
+        
+        if time.monotonic() - self._summaries_saved_at >= self._summary_save_interval:
+            self.save_summaries()
+    
+    def save_summaries(self):
+        """Write the summary cache to disk if it changed since the last write"""
+        with self._save_lock:
+            with self._lock:
+                if not self._summaries_dirty:
+                    return
+                items = list(self._summaries.items())
+                ModelCacheManager._summaries_dirty = False
+                ModelCacheManager._summaries_saved_at = time.monotonic()
             
-        except Exception as e:
-            self.logger.error(f"Failed to load model {model_name}: {e}")
-            # Fallback to smaller model
-            if model_name != 't5-small':
-                self.logger.info("Falling back to t5-small model")
-                return self.get_summarization_pipeline('t5-small')
-            raise
+            # Write then rename, so a crash never leaves a truncated cache
+            path = self._summary_cache_path()
+            try:
+                with open(path + '.tmp', 'wb') as f:
+                    pickle.dump(items, f)
+                os.replace(path + '.tmp', path)
+            except OSError as e:
+                self.logger.warning(f"Failed to persist summary cache: {e}")
+                with self._lock:
+                    ModelCacheManager._summaries_dirty = True
     
     def get_ocr_reader(self, languages=['en'], gpu=None):
         """Get cached OCR reader"""
         if gpu is None:
             gpu = torch.cuda.is_available()
             
-        # Convert list to tuple for hashing
-        lang_tuple = tuple(languages) if isinstance(languages, list) else (languages,)
-        cache_key = f"ocr_{'_'.join(lang_tuple)}_{gpu}"
-        
-        if cache_key in self._models:
-            self.logger.info("Using cached OCR reader")
-            return self._models[cache_key]
+        # A single language may be passed as a plain string
+        if not isinstance(languages, (list, tuple)):
+            languages = [languages]
+        cache_key = self._key('ocr', languages=languages, gpu=gpu)
         
-        start_time = time.time()
-        self.logger.info(f"Loading OCR reader for languages: {languages}")
-        
-        try:
-            reader = easyocr.Reader(languages, gpu=gpu)
-            self._models[cache_key] = reader
-            
-            load_time = time.time() - start_time
-            self.logger.info(f"OCR reader loaded in {load_time:.2f} seconds")
+        with self._load_lock(cache_key):
+            if cache_key in self._models:
+                self.logger.info("Using cached OCR reader")
+                return self._models[cache_key]
             
-            return reader
+            start_time = time.time()
+            self.logger.info(f"Loading OCR reader for languages: {languages}")
             
-        except Exception as e:
-            self.logger.error(f"Failed to load OCR reader: {e}")
-            # Fallback without GPU
-            if gpu:
-                self.logger.info("Falling back to CPU OCR")
-                return self.get_ocr_reader(languages, gpu=False)
-            raise
+            try:
+                reader = easyocr.Reader(list(languages), gpu=gpu)
+                self._models[cache_key] = reader
+                
+                load_time = time.time() - start_time
+                self.logger.info(f"OCR reader loaded in {load_time:.2f} seconds")
+                
+                return reader
+                
+            except Exception as e:
+                self.logger.error(f"Failed to load OCR reader: {e}")
+                # Fallback without GPU
+                if gpu:
+                    self.logger.info("Falling back to CPU OCR")
+                    reader = self.get_ocr_reader(languages, gpu=False)
+                    self._models[cache_key] = reader
+                    return reader
+                raise
     
     def preload_models(self, config: Dict[str, Any]):
         """Preload all models based on configuration"""
         self.logger.info("Preloading models for faster inference...")
         
-        # Preload NLP model
         nlp_config = config.get('nlp', {})
         model_name = nlp_config.get('model', 'sshleifer/distilbart-cnn-12-6')
-        self.get_summarization_pipeline(model_name)
-        
-        # Preload OCR reader
         ocr_config = config.get('ocr', {})
         languages = ocr_config.get('languages', ['en'])
         gpu_enabled = ocr_config.get('gpu_enabled', False)
-        self.get_ocr_reader(languages, gpu_enabled)
+        
+        # The NLP model and OCR reader are independent and spend their load
+        # time in downloads and torch, which release the GIL, so load both at once
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            loads = [
+                executor.submit(self.get_summarization_pipeline, model_name),
+                executor.submit(self.get_ocr_reader, languages, gpu_enabled),
+            ]
+        for load in loads:
+            load.result()
         
         self.logger.info("Model preloading completed!")
     
@@ -144,9 +285,8 @@ class ModelCacheManager:
     def clear_cache(self):
         """Clear all cached models"""
         self.logger.info("Clearing model cache...")
-        self._models.clear()
-        self.get_summarization_pipeline.cache_clear()
-        # Note: get_ocr_reader no longer uses lru_cache
+        with self._lock:
+            self._models.clear()
 
 
 # Global instance
@@ -158,6 +298,21 @@ def get_fast_summarizer(model_name: str = 'sshleifer/distilbart-cnn-12-6'):
     return model_cache.get_summarization_pipeline(model_name)
 
 
+def batch_summarize(texts, model_name: str = 'sshleifer/distilbart-cnn-12-6', batch_size: int = 8, **generate_kwargs):
+    """Summarize several texts with the cached pipeline, batched"""
+    return model_cache.batch_summarize(texts, model_name, batch_size, **generate_kwargs)
+
+
+def get_cached_summary(key: tuple) -> Optional[str]:
+    """Get a summary cached by a previous run, or None"""
+    return model_cache.get_summary(key)
+
+
+def cache_summary(key: tuple, summary: str):
+    """Cache a summary for later runs"""
+    model_cache.store_summary(key, summary)
+
+
 def get_fast_ocr_reader(languages=['en'], gpu=None):
     """Get a fast cached OCR reader"""
     return model_cache.get_ocr_reader(languages, gpu)
@@ -5,13 +5,15 @@ Converts PDF files to images for OCR processing
 
 import os
 import tempfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import logging
 
 # PDF processing libraries
 try:
-    from pdf2image import convert_from_path
+    from pdf2image import convert_from_path, pdfinfo_from_path
     PDF2IMAGE_AVAILABLE = True
 except ImportError:
     PDF2IMAGE_AVAILABLE = False
@@ -24,6 +26,33 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+
+def _render_pymupdf_page(pdf_document, dpi: int, page_num: int, image_path: str) -> str:
+    """Render one page of an open PDF to `image_path`"""
+    page = pdf_document.load_page(page_num)
+
+    # Convert page to a grayscale pixmap, which is all OCR reads
+    pix = page.get_pixmap(matrix=fitz.Matrix(dpi/72, dpi/72), colorspace=fitz.csGRAY, alpha=False)
+
+    # Save pixmap to file
+    pix.save(image_path)
+    return image_path
+
+
+_worker_document = None
+
+
+def _open_worker_document(pdf_path: str):
+    """Open the PDF once in a PyMuPDF worker process, for every page it renders"""
+    global _worker_document
+    _worker_document = fitz.open(pdf_path)
+
+
+def _render_worker_page(dpi: int, page_num: int, image_path: str) -> str:
+    """Render one page of the worker's PDF to `image_path` (a PyMuPDF worker)"""
+    return _render_pymupdf_page(_worker_document, dpi, page_num, image_path)
+
+
 class PDFProcessor:
     """Handles PDF to image conversion for OCR processing"""
 
@@ -42,19 +71,38 @@ class PDFProcessor:
         Returns:
             List of image file paths
         """
+        image_paths = list(self.iter_pdf_images(pdf_path, dpi, fmt))
+
+        logger.info(f"Converted PDF to {len(image_paths)} images")
+        return image_paths
+
+    def iter_pdf_images(self, pdf_path: str, dpi: int = 300, fmt: str = 'PNG',
+                        pages: Optional[List[int]] = None) -> Iterator[str]:
+        """
+        Convert PDF pages to images, yielding each page's image path in page
+        order as soon as it is written while later pages keep rendering, so
+        the caller can start on page 1 straight away
+
+        Args:
+            pdf_path: Path to PDF file
+            dpi: DPI for image conversion (higher = better quality but slower)
+            fmt: Image format (PNG, JPEG, etc.)
+            pages: 0-based numbers of the pages to convert, in order (all if None)
+
+        Yields:
+            Image file paths
+        """
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
 
         # Create temporary directory for images
         self.temp_dir = tempfile.mkdtemp(prefix='pdf_images_')
 
-        image_paths = []
-
         try:
             if PDF2IMAGE_AVAILABLE:
-                image_paths = self._convert_with_pdf2image(pdf_path, dpi, fmt)
+                yield from self._convert_with_pdf2image(pdf_path, dpi, fmt, pages)
             elif PYMU_PDF_AVAILABLE:
-                image_paths = self._convert_with_pymupdf(pdf_path, dpi, fmt)
+                yield from self._convert_with_pymupdf(pdf_path, dpi, fmt, pages)
             else:
                 raise ImportError("No PDF processing library available. Install pdf2image or PyMuPDF")
 
@@ -62,47 +110,69 @@ class PDFProcessor:
             logger.error(f"PDF conversion failed: {e}")
             raise
 
-        logger.info(f"Converted PDF to {len(image_paths)} images")
-        return image_paths
-
-    def _convert_with_pdf2image(self, pdf_path: str, dpi: int, fmt: str) -> List[str]:
+    def _convert_with_pdf2image(self, pdf_path: str, dpi: int, fmt: str,
+                                pages: Optional[List[int]] = None) -> Iterator[str]:
         """Convert PDF using pdf2image library"""
         try:
-            # Convert PDF pages to PIL images
-            pil_images = convert_from_path(pdf_path, dpi=dpi)
-
-            image_paths = []
-            for i, pil_image in enumerate(pil_images):
-                # Save PIL image to file
-                image_path = os.path.join(self.temp_dir, f'page_{i+1:03d}.{fmt.lower()}')
-                pil_image.save(image_path, format=fmt.upper())
-                image_paths.append(image_path)
+            if pages is None:
+                pages = range(pdfinfo_from_path(pdf_path)['Pages'])
+            render = partial(self._render_pdf2image_page, pdf_path, dpi, fmt)
 
-            return image_paths
+            # One pdftoppm process per page, up to one per core but one, leaving
+            # a core for the caller; the threads only wait on the processes
+            workers = max(1, (os.cpu_count() or 2) - 1)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                yield from executor.map(render, [page_num + 1 for page_num in pages])
 
         except Exception as e:
             logger.error(f"pdf2image conversion failed: {e}")
             raise
 
-    def _convert_with_pymupdf(self, pdf_path: str, dpi: int, fmt: str) -> List[str]:
+    def _render_pdf2image_page(self, pdf_path: str, dpi: int, fmt: str, page_num: int) -> str:
+        """Render one page of the PDF into temp_dir with pdf2image"""
+        output_file = f'page_{page_num:03d}'
+        try:
+            # Poppler writes the page straight into temp_dir, so it never goes
+            # through PIL
+            return convert_from_path(pdf_path, dpi=dpi, fmt=fmt.lower(), output_folder=self.temp_dir,
+                                     output_file=output_file, first_page=page_num, last_page=page_num,
+                                     single_file=True, grayscale=True, paths_only=True)[0]
+        except TypeError:
+            # pdf2image before 1.14 has no paths_only
+            pass
+
+        # Convert the PDF page to a PIL image
+        pil_image, = convert_from_path(pdf_path, dpi=dpi, first_page=page_num, last_page=page_num,
+                                       grayscale=True)
+
+        # Save PIL image to file
+        image_path = os.path.join(self.temp_dir, f'{output_file}.{fmt.lower()}')
+        pil_image.save(image_path, format=fmt.upper())
+        return image_path
+
+    def _convert_with_pymupdf(self, pdf_path: str, dpi: int, fmt: str,
+                              pages: Optional[List[int]] = None) -> Iterator[str]:
         """Convert PDF using PyMuPDF library"""
         try:
-            pdf_document = fitz.open(pdf_path)
-            image_paths = []
-
-            for page_num in range(pdf_document.page_count):
-                page = pdf_document.load_page(page_num)
-
-                # Convert page to pixmap
-                pix = page.get_pixmap(matrix=fitz.Matrix(dpi/72, dpi/72))
-
-                # Save pixmap to file
-                image_path = os.path.join(self.temp_dir, f'page_{page_num+1:03d}.{fmt.lower()}')
-                pix.save(image_path)
-                image_paths.append(image_path)
-
-            pdf_document.close()
-            return image_paths
+            with fitz.open(pdf_path) as pdf_document:
+                if pages is None:
+                    pages = range(pdf_document.page_count)
+                image_paths = [os.path.join(self.temp_dir, f'page_{page_num+1:03d}.{fmt.lower()}')
+                               for page_num in pages]
+
+                # MuPDF holds the GIL while rasterizing, so pages are spread over
+                # processes; each opens the PDF once for all of its pages, as
+                # documents can't be shared between processes
+                workers = min(os.cpu_count() or 1, 8, len(pages))
+                if workers <= 1:
+                    for page_num, image_path in zip(pages, image_paths):
+                        yield _render_pymupdf_page(pdf_document, dpi, page_num, image_path)
+                    return
+
+            render = partial(_render_worker_page, dpi)
+            with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker_document,
+                                     initargs=(pdf_path,)) as executor:
+                yield from executor.map(render, pages, image_paths)
 
         except Exception as e:
             logger.error(f"PyMuPDF conversion failed: {e}")
@@ -143,6 +213,46 @@ def convert_pdf_to_images(pdf_path: str, output_dir: Optional[str] = None, dpi:
         logger.error(f"PDF conversion failed: {e}")
         raise
 
+def iter_pdf_images(pdf_path: str, dpi: int = 300, pages: Optional[List[int]] = None) -> Iterator[str]:
+    """
+    Convenience function to convert PDF to images, yielding each page's
+    image path in page order as soon as it is rendered
+
+    Args:
+        pdf_path: Path to PDF file
+        dpi: DPI for conversion
+        pages: 0-based numbers of the pages to convert, in order (all if None)
+
+    Yields:
+        Image file paths
+    """
+    return PDFProcessor().iter_pdf_images(pdf_path, dpi, pages=pages)
+
+def extract_pdf_text(pdf_path: str, min_chars_per_page: int = 200) -> Optional[List[Optional[str]]]:
+    """
+    Read the text embedded in a PDF, page by page
+
+    Args:
+        pdf_path: Path to PDF file
+        min_chars_per_page: Characters below which a page is taken to be
+            scanned
+
+    Returns:
+        Each page's text, with None for the pages that need OCR instead, or
+        None if the embedded text can't be read at all
+    """
+    if not PYMU_PDF_AVAILABLE:
+        return None
+
+    try:
+        with fitz.open(pdf_path) as pdf_document:
+            page_texts = [page.get_text("text") for page in pdf_document]
+    except Exception as e:
+        logger.warning(f"Failed to read embedded PDF text: {e}")
+        return None
+
+    return [text if len(text.strip()) >= min_chars_per_page else None for text in page_texts]
+
 def is_pdf_file(file_path: str) -> bool:
     """Check if file is a PDF"""
     return Path(file_path).suffix.lower() == '.pdf'
@@ -154,10 +264,15 @@ def get_pdf_page_count(pdf_path: str) -> int:
         return 0
 
     try:
-        pdf_document = fitz.open(pdf_path)
-        page_count = pdf_document.page_count
-        pdf_document.close()
-        return page_count
+        # Keyed on the file's mtime and size as well, so an edited PDF is re-read
+        stat = os.stat(pdf_path)
+        return _pdf_page_count(pdf_path, stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         logger.error(f"Failed to get page count: {e}")
         return 0
+
+@lru_cache(maxsize=64)
+def _pdf_page_count(pdf_path: str, mtime_ns: int, size: int) -> int:
+    """Page count of one version of a PDF, parsed once"""
+    with fitz.open(pdf_path) as pdf_document:
+        return pdf_document.page_count
@@ -5,7 +5,7 @@ File: text_to_animation_full_project.py
 This single-file prototype implements a workable pipeline to convert
 handwritten note images (or typed images) into a short animated explainer
 video. It uses easyocr for OCR, Hugging Face transformers for summarization,
-gTTS for text-to-speech, and MoviePy + PIL for simple animated slides.
+gTTS for text-to-speech, and ffmpeg + PIL for simple animated slides.
 
 This is intended as a practical, runnable MVP — not a production system.
 
@@ -39,8 +39,13 @@ import os
 import io
 import sys
 import time
+import subprocess
+import tempfile
 import argparse
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import count, islice
+from typing import List, Optional
 
 # OCR
 import easyocr
@@ -54,14 +59,15 @@ from transformers import pipeline
 from gtts import gTTS
 
 # Video
-from moviepy.video.VideoClip import ImageClip
-from moviepy.audio.io.AudioFileClip import AudioFileClip
-from moviepy.video.compositing.CompositeVideoClip import concatenate_videoclips
+import imageio_ffmpeg
 
 # Model Cache for performance optimization
-from .model_cache import get_fast_summarizer, get_fast_ocr_reader, preload_all_models
-from .intelligent_animator import create_intelligent_animation, ContentAnalyzer
-from .pdf_utils import convert_pdf_to_images, is_pdf_file
+from .model_cache import (
+    get_fast_summarizer, get_fast_ocr_reader, preload_all_models,
+    ModelCacheManager, get_cached_summary, cache_summary, batch_summarize
+)
+from .intelligent_animator import create_intelligent_animation, ContentAnalyzer, media_duration
+from .pdf_utils import extract_pdf_text, iter_pdf_images, is_pdf_file
 
 # Streamlit
 try:
@@ -71,6 +77,8 @@ except Exception:
 
 # ------------------------- Configuration -------------------------
 OCR_LANGS = ['en']  # adjust if notes have other languages
+OCR_BATCH_SIZE = 8  # PDF pages read per EasyOCR call
+OCR_PDF_DPI = 200  # EasyOCR downscales anyway; plenty for printed text
 # Performance optimized models - choose based on speed vs quality needs
 SUMMARIZER_MODEL = 'sshleifer/distilbart-cnn-12-6'  # Fast, good quality (recommended)
 # SUMMARIZER_MODEL = 'facebook/bart-large-cnn'  # Slower but higher quality
@@ -93,6 +101,33 @@ def extract_text_from_image(image_path: str) -> str:
     text = "\n".join(results)
     return text
 
+
+def extract_text_from_images(image_paths: List[str], batch_size: int = 8) -> List[str]:
+    """Run EasyOCR on several images at once and return each one's concatenated text.
+
+    Detection runs over all the images as one batch and recognition batches
+    their text crops, instead of paying the model overhead per image. That
+    needs images of one size, like the pages of a PDF; otherwise each image
+    is read on its own.
+    """
+    reader = get_easyocr_reader()
+    try:
+        results = reader.readtext_batched(image_paths, batch_size=batch_size, detail=0)
+    except (ValueError, TypeError, RuntimeError):
+        results = [reader.readtext(image_path, detail=0) for image_path in image_paths]
+    return ["\n".join(result) for result in results]
+
+
+def ocr_pdf_pages(pdf_path: str, pages: Optional[List[int]] = None, dpi: int = OCR_PDF_DPI):
+    """Yield (0-based page number, OCR text) pairs for a PDF's pages, all of
+    them or just `pages`, one batch of pages at a time."""
+    # Extract text from the pages in batches as soon as they are
+    # converted, while the later pages are still being rendered
+    images = iter_pdf_images(pdf_path, dpi=dpi, pages=pages)
+    page_nums = iter(pages) if pages is not None else count()
+    while batch := list(islice(images, OCR_BATCH_SIZE)):
+        yield [(next(page_nums), text) for text in extract_text_from_images(batch)]
+
 # ------------------------- NLP / Summarization -------------------------
 def get_summarizer():
     """Get cached summarization pipeline for better performance"""
@@ -105,6 +140,19 @@ def clean_text(text: str) -> str:
 
 
 def summarize_text(text: str, max_length=130, min_length=30) -> str:
+    # Re-submitted notes reuse their summary instead of re-running the model.
+    # Keyed on the model that actually loaded, which differs from
+    # SUMMARIZER_MODEL when the loader fell back to t5-small
+    model_name = get_summarizer().model.name_or_path
+    key = ModelCacheManager.summary_key(model_name, text, max_length, min_length)
+    summary = get_cached_summary(key)
+    if summary is None:
+        summary = _summarize_text(text, max_length, min_length)
+        cache_summary(key, summary)
+    return summary
+
+
+def _summarize_text(text: str, max_length: int, min_length: int) -> str:
     summarizer = get_summarizer()
     # HuggingFace summarizers expect reasonably long input; chunk if needed
     # Simple chunker by characters
@@ -114,10 +162,9 @@ def summarize_text(text: str, max_length=130, min_length=30) -> str:
         return out[0]['summary_text']
 
     chunks = [text[i:i+CHUNK_SIZE] for i in range(0, len(text), CHUNK_SIZE)]
-    summaries = []
-    for c in chunks:
-        s = summarizer(c, max_length=max_length, min_length=min_length, do_sample=False)
-        summaries.append(s[0]['summary_text'])
+    # The chunks are independent, so they go through the model in batches
+    summaries = batch_summarize(chunks, SUMMARIZER_MODEL, max_length=max_length,
+                                min_length=min_length, do_sample=False)
     combined = ' '.join(summaries)
     # optionally summarize again
     out = summarizer(combined, max_length=max_length, min_length=min_length, do_sample=False)
@@ -128,7 +175,9 @@ def summarize_text(text: str, max_length=130, min_length=30) -> str:
 def text_to_speech(text: str, out_path: str, lang='en') -> str:
     """Use gTTS to create an mp3 audio file from text and return path."""
     tts = gTTS(text=text, lang=lang)
-    tts.save(out_path)
+    # gTTS streams the audio in small chunks, so buffer them into large writes
+    with open(out_path, 'wb', buffering=1 << 20) as f:
+        tts.write_to_fp(f)
     return out_path
 
 # ------------------------- Animation / Video generation -------------------------
@@ -152,75 +201,97 @@ def split_summary_to_slides(summary: str, max_chars=200) -> List[str]:
     return slides
 
 
-def create_slide_image(text: str, out_path: str, size=(1280, 720), bgcolor=(255,255,255)) -> str:
-    """Render a single slide with text using PIL and save to out_path."""
-    W, H = size
-    img = Image.new('RGB', size, color=bgcolor)
-    draw = ImageDraw.Draw(img)
-
-    # Load a font
+@lru_cache(maxsize=None)
+def _slide_font(font_path: Optional[str]):
+    """Load the slide font once, with its line height"""
     try:
-        if FONT_PATH and os.path.exists(FONT_PATH):
-            font = ImageFont.truetype(FONT_PATH, 36)
+        if font_path and os.path.exists(font_path):
+            font = ImageFont.truetype(font_path, 36)
         else:
             font = ImageFont.load_default()
     except Exception:
         font = ImageFont.load_default()
 
+    # Calculate line height using getbbox instead of deprecated getsize
+    bbox = font.getbbox('A')
+    line_h = (bbox[3] - bbox[1]) + 8  # height = bottom - top + spacing
+    return font, line_h
+
+
+def create_slide_image(text: str, out_path: str, size=(1280, 720), bgcolor=(255,255,255)) -> str:
+    """Render a single slide with text using PIL and save to out_path."""
+    W, H = size
+    img = Image.new('RGB', size, color=bgcolor)
+    draw = ImageDraw.Draw(img)
+    font, line_h = _slide_font(FONT_PATH)
+
     # Simple text wrapping
     margin = 40
     max_w = W - 2*margin
     words = text.split()
     lines = []
     cur = ''
+    # Measure each word once and keep a running line width, rather than
+    # re-measuring the whole line as every word is added
+    space_w = font.getlength(' ')
+    cur_w = 0
     for w in words:
-        test = cur + (' ' if cur else '') + w
-        # Use textbbox instead of deprecated textsize
-        bbox = draw.textbbox((0, 0), test, font=font)
-        wsize = bbox[2] - bbox[0]  # width = right - left
-        if wsize <= max_w:
-            cur = test
+        word_w = font.getlength(w)
+        test_w = cur_w + space_w + word_w if cur else word_w
+        if test_w <= max_w:
+            cur = cur + (' ' if cur else '') + w
+            cur_w = test_w
         else:
             lines.append(cur)
             cur = w
+            cur_w = word_w
     if cur:
         lines.append(cur)
 
     y = margin
-    # Calculate line height using textbbox instead of deprecated textsize
-    bbox = draw.textbbox((0, 0), 'A', font=font)
-    line_h = (bbox[3] - bbox[1]) + 8  # height = bottom - top + spacing
     for line in lines:
         draw.text((margin, y), line, fill=(0,0,0), font=font)
         y += line_h
         if y > H - margin:
             break
 
-    img.save(out_path)
+    # The slide is decoded and re-encoded into the video straight away, so
+    # spend as little time as possible in zlib
+    img.save(out_path, compress_level=1)
     return out_path
 
 
 def make_video_from_slides(slide_paths: List[str], audio_path: str, out_video_path: str, slide_duration=4):
-    """Create a video from slide images, apply simple crossfade transitions and merge audio."""
-    clips = []
-    for sp in slide_paths:
-        clip = ImageClip(sp).set_duration(slide_duration)
-        clips.append(clip)
-
-    video = concatenate_videoclips(clips, method='compose')
-
-    if audio_path and os.path.exists(audio_path):
-        audio = AudioFileClip(audio_path)
-        # Ensure video length >= audio length; if video shorter, extend last slide
-        if video.duration < audio.duration:
-            diff = audio.duration - video.duration
-            last = clips[-1].fx(lambda c: c).set_duration(clips[-1].duration + diff)
-            clips[-1] = last
-            video = concatenate_videoclips(clips, method='compose')
-        video = video.set_audio(audio)
+    """Create a video from slide images and merge audio."""
+    # The slides are stills, so ffmpeg's concat demuxer shows each one for its
+    # duration and only the encoder sees the frames
+    durations = [slide_duration] * len(slide_paths)
+    has_audio = audio_path and os.path.exists(audio_path)
+    if has_audio:
+        # Ensure video length >= audio length; if video shorter, extend last slide.
+        durations[-1] = max(slide_duration,
+                            media_duration(audio_path) - slide_duration * (len(slide_paths) - 1))
+    lines = ['ffconcat version 1.0']
+    for sp, duration in zip(slide_paths, durations):
+        lines += [f"file '{os.path.abspath(sp)}'", f'duration {duration}']
+    # The concat demuxer ignores the duration of the last file, so list it again
+    lines.append(f"file '{os.path.abspath(slide_paths[-1])}'")
+    fd, list_path = tempfile.mkstemp(suffix='.ffconcat', dir=TMP_DIR)
+    with os.fdopen(fd, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+    command = [imageio_ffmpeg.get_ffmpeg_exe(), '-y', '-loglevel', 'error',
+               '-f', 'concat', '-safe', '0', '-i', list_path]
+    if has_audio:
+        command += ['-i', audio_path, '-c:a', 'aac']
+    command += ['-vf', 'fps=24,format=yuv420p']
+    command += ['-c:v', 'libx264', '-tune', 'stillimage', out_video_path]
 
     # write the file
-    video.write_videofile(out_video_path, fps=24, codec='libx264', audio_codec='aac')
+    try:
+        subprocess.run(command, check=True)
+    finally:
+        os.remove(list_path)
     return out_video_path
 
 # ------------------------- Pipeline -------------------------
@@ -248,22 +319,34 @@ def run_pipeline(input_file: str, output_video: str):
     if is_pdf_file(input_file):
         print(f'📄 Detected PDF file: {input_file}')
         try:
-            # Convert PDF to images
-            pdf_images = convert_pdf_to_images(input_file, dpi=300)
-            print(f'✅ Converted PDF to {len(pdf_images)} images')
-
-            # Extract text from each page
             all_text = []
-            for i, image_path in enumerate(pdf_images):
-                print(f'🔍 Processing page {i+1}/{len(pdf_images)}...')
-                page_text = extract_text_from_image(image_path)
+            # Pages that carry their own text are read as is; only scanned
+            # pages go through OCR, or every page if the text can't be read
+            page_texts = extract_pdf_text(input_file)
+            if page_texts is not None:
+                ocr_pages = [page_num for page_num, text in enumerate(page_texts) if text is None]
+                print(f'📝 Using the text embedded in {len(page_texts) - len(ocr_pages)} '
+                      f'of {len(page_texts)} PDF pages')
+            else:
+                page_texts, ocr_pages = [], None
+            if ocr_pages is None or ocr_pages:
+                for batch in ocr_pdf_pages(input_file, ocr_pages):
+                    print(f'🔍 Processing pages {", ".join(str(page_num + 1) for page_num, _ in batch)}...')
+                    for page_num, page_text in batch:
+                        if page_num < len(page_texts):
+                            page_texts[page_num] = page_text
+                        else:
+                            page_texts.append(page_text)
+
+            page_count = len(page_texts)
+            for page_num, page_text in enumerate(page_texts, 1):
                 if page_text.strip():
-                    all_text.append(f"--- Page {i+1} ---\n{page_text}")
+                    all_text.append(f"--- Page {page_num} ---\n{page_text}")
                 else:
-                    print(f'⚠️ No text found on page {i+1}')
+                    print(f'⚠️ No text found on page {page_num}')
 
             raw_text = "\n\n".join(all_text)
-            print(f'✅ Extracted text from {len(pdf_images)} PDF pages')
+            print(f'✅ Extracted text from {page_count} PDF pages')
 
         except Exception as e:
             print(f'❌ PDF processing failed: {e}')
@@ -314,11 +397,11 @@ def run_pipeline(input_file: str, output_video: str):
     print('\n5) Slide generation...')
     start_time = time.time()
     slides = split_summary_to_slides(summary, max_chars=220)
-    slide_paths = []
-    for i, s in enumerate(slides):
-        p = os.path.join(TMP_DIR, f'slide_{i}.png')
-        create_slide_image(s, p)
-        slide_paths.append(p)
+    slide_paths = [os.path.join(TMP_DIR, f'slide_{i}.png') for i in range(len(slides))]
+    # Slides are independent and PIL releases the GIL while drawing and
+    # PNG-encoding them, so they render side by side
+    with ThreadPoolExecutor(max_workers=max(1, min(8, os.cpu_count() or 1, len(slides)))) as executor:
+        list(executor.map(create_slide_image, slides, slide_paths))
     print(f'Slide generation completed in {time.time() - start_time:.2f}s')
 
     print('\n6) Video rendering...')